@@ -4,10 +4,10 @@ from news_fetcher import NewsFetcher
 from summarizer import NewsSummarizer
 from filter_engine import ArticleFilter
 from location_service import LocationService
+from autocomplete import AutocompleteService
 from datetime import datetime
-from typing import List
+from typing import Iterator, List, Union
 import os
-import requests
 
 
 # API key for LocationIQ API service
@@ -50,9 +50,53 @@ def save_preferences(interests: List[str]):
     with open("config/user_preferences.json", "w") as f:
         json.dump(preferences, f, indent=4)
 
+@st.cache_resource
+def get_autocomplete_service() -> AutocompleteService:
+    """
+    Create the address autocomplete service once per process, so its connection pool
+    and in-memory cache are shared by every session and rerun.
+
+    Returns:
+        AutocompleteService: The shared autocomplete service.
+    """
+    return AutocompleteService(API_KEY)
+
+@st.cache_resource
+def get_news_fetcher() -> NewsFetcher:
+    """
+    Create the news fetcher once per process, so its response cache and rate limiter
+    are shared by every session and rerun.
+
+    Returns:
+        NewsFetcher: The shared news fetcher.
+    """
+    return NewsFetcher()
+
+@st.cache_resource
+def get_summarizer() -> NewsSummarizer:
+    """
+    Create the summarizer once per process, so its pooled HTTP session, model client
+    and caches are reused instead of being rebuilt on every rerun.
+
+    Returns:
+        NewsSummarizer: The shared summarizer.
+    """
+    return NewsSummarizer()
+
+@st.cache_resource
+def get_article_filter() -> ArticleFilter:
+    """
+    Create the article filter once per process.
+
+    Returns:
+        ArticleFilter: The shared article filter.
+    """
+    return ArticleFilter()
+
 def fetch_autocomplete(query):
     """
     Fetch autocomplete suggestions for a given address query from the LocationIQ API.
+    Queries shorter than a few characters are skipped, and results are cached.
 
     Args:
         query (str): The address query to be autocompleted.
@@ -60,15 +104,32 @@ def fetch_autocomplete(query):
     Returns:
         list: A list of autocomplete suggestions, or an empty list if the request fails.
     """
-    url = f"https://us1.locationiq.com/v1/autocomplete.php?key={API_KEY}&q={query}&format=json&limit=5"
-    
-    # Send request to the LocationIQ API
-    response = requests.get(url)
-    
-    # Return JSON response if successful, otherwise return an empty list
-    if response.status_code == 200:
-        return response.json()
-    return []
+    return get_autocomplete_service().suggest(query)
+
+def display_article(article: dict, summary: Union[str, Iterator[str]]):
+    """
+    Display an article and its summary inside an expander.
+
+    Args:
+        article (dict): The article to display.
+        summary (Union[str, Iterator[str]]): The generated summary of the article, or a
+            stream of summary text that is written out as it arrives.
+    """
+    with st.expander(f"📰 {article['title']}", expanded=False):
+        col1, col2 = st.columns([2, 1])
+
+        with col1:
+            st.markdown(f"**Title:** {article['title']}")
+            st.markdown(f"**Source:** {article.get('source', 'Unknown')}")
+            st.markdown(f"**Published:** {article['published'].strftime('%Y-%m-%d %H:%M')}")
+            st.markdown("### Summary")
+            if isinstance(summary, str):
+                st.write(summary)
+            else:
+                st.write_stream(summary)
+        with col2:
+            st.markdown("### Original Article")
+            st.link_button('Read Full Article', article["link"])
 
 def main():
     """
@@ -80,9 +141,9 @@ def main():
 
     # Initialize necessary components
     location_service = LocationService()
-    fetcher = NewsFetcher()
-    summarizer = NewsSummarizer()
-    filter_engine = ArticleFilter()
+    fetcher = get_news_fetcher()
+    summarizer = get_summarizer()
+    filter_engine = get_article_filter()
 
     # Load the current user preferences (interests)
     preferences = load_configs()
@@ -146,6 +207,9 @@ def main():
         # Time range selector for news articles
         time_range = st.radio("Time range", ["today", "week", "month"], index=1)
 
+        # Stream each summary into its article as it is generated
+        stream_summaries = st.checkbox("Stream summaries", value=True)
+
         # Save the selected preferences
         if st.button("Save Preferences"):
             save_preferences(interests)
@@ -170,29 +234,20 @@ def main():
         )
         return
     
-    # Display the filtered articles with summaries
-    for article in filtered_articles:
-        print(f"Extracting full text from URL: {article['link']}")
-        
-        # Extract the full text of the article
-        article["full_text"] = summarizer.extract_full_text(article["link"])
-        
-        with st.expander(f"📰 {article['title']}", expanded=False):
-            col1, col2 = st.columns([2, 1])
-
-            with col1:
-                st.markdown(f"**Title:** {article['title']}")
-                st.markdown(f"**Source:** {article.get('source', 'Unknown')}")
-                st.markdown(f"**Published:** {article['published'].strftime('%Y-%m-%d %H:%M')}")
-                
-                # Generate and display the article summary
-                with st.spinner("Generating summary..."):
-                    summary = summarizer.generate_summary(article)
-                st.markdown("### Summary")
-                st.write(summary)
-            with col2:
-                st.markdown("### Original Article")
-                st.link_button('Read Full Article', article["link"])
+    if stream_summaries:
+        # Summaries are generated concurrently in the background and streamed in order
+        for index, article, summary_stream in summarizer.stream_articles(filtered_articles):
+            display_article(article, summary_stream)
+        return
+
+    # Reserve a slot for each article so they keep their order while finishing at different times
+    placeholders = [st.empty() for _ in filtered_articles]
+
+    # Extract and summarize the articles concurrently, displaying each one as soon as it is ready
+    with st.spinner("Generating summaries..."):
+        for index, article, summary in summarizer.process_articles(filtered_articles):
+            with placeholders[index].container():
+                display_article(article, summary)
 
 if __name__ == "__main__":
     # Run the main function if the script is executed directly
@@ -0,0 +1,214 @@
+import os
+import re
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from cache_store import SQLiteCache
+
+# LocationIQ autocomplete endpoint; point this at a local stand-in (see autocomplete_stub.py) for testing
+DEFAULT_AUTOCOMPLETE_URL = "https://us1.locationiq.com/v1/autocomplete.php"
+
+class AutocompleteService:
+    """
+    This class provides address autocomplete suggestions from the LocationIQ API.
+    Suggestions are cached in memory (LRU) and on disk, and a result for a shorter
+    prefix held in memory is filtered locally when it already holds every match, so
+    most keystrokes after the first few characters never reach the network.
+    """
+
+    def __init__(
+            self,
+            api_key: str,
+            base_url: Optional[str] = None,
+            limit: int = 5,
+            min_chars: int = 3,
+            timeout: float = 5,
+            memory_size: int = 1000,
+            cache_ttl: float = 7 * 24 * 3600,
+    ):
+        """
+        Initializes the AutocompleteService with a pooled HTTP session and its caches.
+
+        Args:
+            api_key (str): The LocationIQ API key.
+            base_url (Optional[str]): The autocomplete endpoint. Defaults to the
+                LOCATIONIQ_AUTOCOMPLETE_URL environment variable or the LocationIQ API.
+            limit (int): Maximum number of suggestions per query.
+            min_chars (int): Minimum query length before suggestions are requested.
+            timeout (float): Request timeout in seconds.
+            memory_size (int): Number of queries kept in the in-memory LRU cache.
+            cache_ttl (float): Seconds a cached suggestion list is reused.
+        """
+        self.api_key = api_key
+        self.base_url = base_url or os.getenv("LOCATIONIQ_AUTOCOMPLETE_URL", DEFAULT_AUTOCOMPLETE_URL)
+        self.limit = limit
+        self.min_chars = min_chars
+        self.timeout = timeout
+
+        # Pooled session so consecutive lookups reuse the same connection
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_maxsize=4, max_retries=Retry(total=1, backoff_factor=0.2))
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+        # In-memory LRU shared by every session using this instance, backed by a disk cache
+        self.memory_size = memory_size
+        self.memory = OrderedDict()
+        self.lock = threading.Lock()
+        self.disk_cache = SQLiteCache(
+            "config/autocomplete_cache.sqlite", table="autocomplete", ttl=cache_ttl, max_entries=20000
+        )
+
+    def _normalize(self, query: str) -> str:
+        """
+        Normalizes a query so equivalent inputs share a cache entry.
+
+        Args:
+            query (str): The raw query typed by the user.
+
+        Returns:
+            str: The lowercased query with collapsed whitespace.
+        """
+        return " ".join(query.lower().split())
+
+    def _lookup(self, query: str) -> Optional[List[Dict]]:
+        """
+        Looks a normalized query up in the memory cache, then in the disk cache.
+
+        Args:
+            query (str): The normalized query.
+
+        Returns:
+            Optional[List[Dict]]: The cached suggestions, or None if the query isn't cached.
+        """
+        with self.lock:
+            if query in self.memory:
+                self.memory.move_to_end(query)
+                return self.memory[query]
+
+        suggestions = self.disk_cache.get(self.disk_cache.make_key(query))
+        if suggestions is not None:
+            self._remember(query, suggestions)
+        return suggestions
+
+    def _remember(self, query: str, suggestions: List[Dict]):
+        """
+        Stores suggestions in the in-memory LRU cache.
+
+        Args:
+            query (str): The normalized query.
+            suggestions (List[Dict]): The suggestions for the query.
+        """
+        with self.lock:
+            self.memory[query] = suggestions
+            self.memory.move_to_end(query)
+            if len(self.memory) > self.memory_size:
+                self.memory.popitem(last=False)
+
+    def _lookup_prefix(self, query: str) -> Optional[List[Dict]]:
+        """
+        Finds the longest prefix of a query whose complete result list is held in memory.
+
+        Args:
+            query (str): The normalized query.
+
+        Returns:
+            Optional[List[Dict]]: The prefix's suggestions, or None if no prefix qualifies.
+        """
+        with self.lock:
+            for end in range(len(query) - 1, self.min_chars - 1, -1):
+                prefix_results = self.memory.get(query[:end])
+                if prefix_results is not None and len(prefix_results) < self.limit:
+                    self.memory.move_to_end(query[:end])
+                    return prefix_results
+        return None
+
+    def _store(self, query: str, suggestions: List[Dict]):
+        """
+        Stores suggestions in both caches.
+
+        Args:
+            query (str): The normalized query.
+            suggestions (List[Dict]): The suggestions for the query.
+        """
+        self._remember(query, suggestions)
+        self.disk_cache.set(self.disk_cache.make_key(query), suggestions)
+
+    def _matches(self, suggestion: Dict, query: str) -> bool:
+        """
+        Checks whether a suggestion matches a query, i.e. every word of the query is
+        the start of a word in the suggestion's display name. This mirrors how
+        LocationIQ matches autocomplete queries; if the API ever matched more loosely
+        (e.g. fuzzy or mid-word), filtering a prefix's results could miss suggestions
+        until the memory cache turns over.
+
+        Args:
+            suggestion (Dict): A suggestion returned by the API.
+            query (str): The normalized query.
+
+        Returns:
+            bool: True if the suggestion matches the query.
+        """
+        words = re.findall(r"\w+", suggestion.get("display_name", "").lower())
+        return all(
+            any(word.startswith(term) for word in words)
+            for term in re.findall(r"\w+", query)
+        )
+
+    def suggest(self, query: str) -> List[Dict]:
+        """
+        Returns autocomplete suggestions for an address query.
+
+        Args:
+            query (str): The address query to be autocompleted.
+
+        Returns:
+            List[Dict]: A list of autocomplete suggestions, or an empty list if the query is
+            too short or the request fails.
+        """
+        normalized = self._normalize(query)
+        if len(normalized) < self.min_chars:
+            return []
+
+        cached = self._lookup(normalized)
+        if cached is not None:
+            return cached
+
+        # A shorter prefix that returned fewer than `limit` results already holds every
+        # match for this longer query, so it can be filtered locally. Only the in-memory
+        # LRU is searched, so a keystroke costs at most one disk lookup (the one above)
+        prefix_results = self._lookup_prefix(normalized)
+        if prefix_results is not None:
+            suggestions = [item for item in prefix_results if self._matches(item, normalized)]
+            self._store(normalized, suggestions)
+            return suggestions
+
+        try:
+            # Send request to the LocationIQ API
+            response = self.session.get(
+                self.base_url,
+                params={"key": self.api_key, "q": query, "format": "json", "limit": self.limit},
+                timeout=self.timeout,
+            )
+        except requests.exceptions.RequestException as e:
+            print(f"Autocomplete request failed: {e}")
+            return []
+
+        # LocationIQ answers 404 when nothing matches, which is worth caching too
+        if response.status_code == 404:
+            suggestions = []
+        elif response.status_code == 200:
+            try:
+                suggestions = response.json()
+            except ValueError as e:
+                # E.g. an HTML error page from a proxy
+                print(f"Autocomplete response was not JSON: {e}")
+                return []
+        else:
+            return []
+
+        self._store(normalized, suggestions)
+        return suggestions
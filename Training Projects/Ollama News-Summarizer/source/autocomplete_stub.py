@@ -0,0 +1,120 @@
+"""
+A small local stand-in for the LocationIQ autocomplete API, so the address
+autocomplete can be tried out and tested without an API key or network access.
+
+Usage:
+    python autocomplete_stub.py [port]
+    LOCATIONIQ_AUTOCOMPLETE_URL=http://localhost:8765/v1/autocomplete.php streamlit run app.py
+"""
+import json
+import re
+import sys
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+# Canned places returned by the stand-in service, in the same shape as LocationIQ results
+PLACES = [
+    {"city": "Edmonton", "state": "Alberta", "country": "Canada"},
+    {"city": "Calgary", "state": "Alberta", "country": "Canada"},
+    {"city": "Red Deer", "state": "Alberta", "country": "Canada"},
+    {"city": "Vancouver", "state": "British Columbia", "country": "Canada"},
+    {"city": "Victoria", "state": "British Columbia", "country": "Canada"},
+    {"city": "Saskatoon", "state": "Saskatchewan", "country": "Canada"},
+    {"city": "Regina", "state": "Saskatchewan", "country": "Canada"},
+    {"city": "Winnipeg", "state": "Manitoba", "country": "Canada"},
+    {"city": "Toronto", "state": "Ontario", "country": "Canada"},
+    {"city": "Ottawa", "state": "Ontario", "country": "Canada"},
+    {"city": "Montreal", "state": "Quebec", "country": "Canada"},
+    {"city": "Quebec City", "state": "Quebec", "country": "Canada"},
+    {"city": "Halifax", "state": "Nova Scotia", "country": "Canada"},
+]
+
+def search_places(query: str, limit: int = 5) -> list:
+    """
+    Returns the canned places whose name starts with every word of the query.
+
+    Args:
+        query (str): The address query.
+        limit (int): Maximum number of results.
+
+    Returns:
+        list: Matching places in the LocationIQ autocomplete format.
+    """
+    terms = re.findall(r"\w+", query.lower())
+    results = []
+    for index, place in enumerate(PLACES):
+        display_name = f"{place['city']}, {place['state']}, {place['country']}"
+        words = re.findall(r"\w+", display_name.lower())
+        if terms and all(any(word.startswith(term) for word in words) for term in terms):
+            results.append({
+                "place_id": str(index),
+                "display_name": display_name,
+                "address": {"name": place["city"], **place},
+            })
+    return results[:limit]
+
+class AutocompleteHandler(BaseHTTPRequestHandler):
+    """
+    Request handler answering GET /v1/autocomplete.php like the LocationIQ API.
+    """
+
+    def do_GET(self):
+        url = urlparse(self.path)
+
+        # Simulates a misbehaving upstream that answers 200 with an HTML page
+        if url.path == "/v1/broken.php":
+            data = b"<html><body>Service temporarily unavailable</body></html>"
+            self.send_response(200)
+            self.send_header("Content-Type", "text/html")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+            return
+
+        if url.path != "/v1/autocomplete.php":
+            self._send_json(404, {"error": "Not found"})
+            return
+
+        params = parse_qs(url.query)
+        if not params.get("key"):
+            self._send_json(401, {"error": "Invalid key"})
+            return
+
+        query = params.get("q", [""])[0]
+        limit = int(params.get("limit", ["5"])[0])
+        results = search_places(query, limit)
+
+        # LocationIQ answers 404 when nothing matches
+        if results:
+            self._send_json(200, results)
+        else:
+            self._send_json(404, {"error": "Unable to geocode"})
+
+    def _send_json(self, status: int, body):
+        data = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+def run(port: int = 8765) -> ThreadingHTTPServer:
+    """
+    Creates the stand-in server on localhost. Call serve_forever() on the result to start it.
+
+    Args:
+        port (int): The port to listen on, or 0 to pick a free one.
+
+    Returns:
+        ThreadingHTTPServer: The server instance.
+    """
+    return ThreadingHTTPServer(("127.0.0.1", port), AutocompleteHandler)
+
+if __name__ == "__main__":
+    port = int(sys.argv[1]) if len(sys.argv) > 1 else 8765
+    server = run(port)
+    print(f"Autocomplete stand-in listening on http://127.0.0.1:{server.server_port}/v1/autocomplete.php")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        server.server_close()
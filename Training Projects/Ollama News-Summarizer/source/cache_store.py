@@ -0,0 +1,170 @@
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import time
+from typing import Any, Optional
+
+class SQLiteCache:
+    """
+    This class provides a small persistent key-value cache backed by SQLite.
+    Values are stored as JSON together with the time they were written, so entries
+    older than the configured time-to-live are treated as expired. An optional entry
+    limit evicts the least recently used entries. Because the data lives in a SQLite
+    file, the cache is shared by every Streamlit session and process.
+    """
+
+    def __init__(
+            self,
+            db_path: str = "config/cache.sqlite",
+            table: str = "cache",
+            ttl: Optional[float] = 3600,
+            max_entries: Optional[int] = None,
+    ):
+        """
+        Initializes the SQLiteCache and creates its table if it doesn't exist.
+
+        Args:
+            db_path (str): Path to the SQLite database file.
+            table (str): Name of the table used by this cache.
+            ttl (Optional[float]): Time-to-live of an entry in seconds, or None to never expire.
+            max_entries (Optional[int]): Maximum number of entries kept, or None for no limit.
+        """
+        if not re.fullmatch(r"[A-Za-z_][A-Za-z0-9_]*", table):
+            raise ValueError(f"Invalid cache table name: {table}")
+
+        self.db_path = db_path
+        self.table = table
+        self.ttl = ttl
+        self.max_entries = max_entries
+
+        # Ensure the directory holding the database exists
+        os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+
+        with self._connect() as conn:
+            conn.execute(
+                f"""
+                CREATE TABLE IF NOT EXISTS {self.table}(
+                    key TEXT PRIMARY KEY,
+                    value TEXT NOT NULL,
+                    created_at REAL NOT NULL,
+                    accessed_at REAL NOT NULL DEFAULT 0
+                )
+                """
+            )
+
+            # Add the access time column to tables created before eviction was supported
+            columns = [row[1] for row in conn.execute(f"PRAGMA table_info({self.table})")]
+            if "accessed_at" not in columns:
+                conn.execute(f"ALTER TABLE {self.table} ADD COLUMN accessed_at REAL NOT NULL DEFAULT 0")
+            conn.execute(f"CREATE INDEX IF NOT EXISTS idx_{self.table}_accessed ON {self.table}(accessed_at)")
+
+    def _connect(self) -> sqlite3.Connection:
+        """
+        Opens a new connection. WAL mode lets readers in other processes keep working
+        while one process writes.
+
+        Returns:
+            sqlite3.Connection: An open connection to the cache database.
+        """
+        conn = sqlite3.connect(self.db_path, timeout=10)
+        conn.execute("PRAGMA journal_mode=WAL")
+        return conn
+
+    @staticmethod
+    def make_key(*parts: Any) -> str:
+        """
+        Builds a stable cache key from any JSON-serializable values.
+
+        Args:
+            *parts (Any): The values identifying the cached item.
+
+        Returns:
+            str: A SHA-256 hex digest of the serialized values.
+        """
+        raw = json.dumps(parts, sort_keys=True, default=str)
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def get(self, key: str, allow_stale: bool = False) -> Optional[Any]:
+        """
+        Retrieves a cached value.
+
+        Args:
+            key (str): The cache key.
+            allow_stale (bool): Whether to return the value even if it has expired.
+
+        Returns:
+            Optional[Any]: The cached value, or None if it is missing or expired.
+        """
+        try:
+            with self._connect() as conn:
+                row = conn.execute(
+                    f"SELECT value, created_at FROM {self.table} WHERE key = ?", (key,)
+                ).fetchone()
+        except sqlite3.Error as e:
+            print(f"Error reading cache {self.table}: {e}")
+            return None
+
+        if row is None:
+            return None
+
+        value, created_at = row
+        if not allow_stale and self.ttl is not None and time.time() - created_at > self.ttl:
+            return None
+
+        # Only track access times when they are needed to decide what to evict
+        if self.max_entries is not None:
+            try:
+                with self._connect() as conn:
+                    conn.execute(
+                        f"UPDATE {self.table} SET accessed_at = ? WHERE key = ?", (time.time(), key)
+                    )
+            except sqlite3.Error as e:
+                print(f"Error updating cache {self.table}: {e}")
+
+        return json.loads(value)
+
+    def set(self, key: str, value: Any):
+        """
+        Stores a value in the cache, replacing any previous entry for the key.
+
+        Args:
+            key (str): The cache key.
+            value (Any): A JSON-serializable value to store.
+        """
+        now = time.time()
+        try:
+            with self._connect() as conn:
+                conn.execute(
+                    f"INSERT OR REPLACE INTO {self.table}(key, value, created_at, accessed_at) VALUES (?, ?, ?, ?)",
+                    (key, json.dumps(value, default=str), now, now),
+                )
+
+                # Evict the least recently used entries once the limit is exceeded
+                if self.max_entries is not None:
+                    conn.execute(
+                        f"""
+                        DELETE FROM {self.table} WHERE key NOT IN (
+                            SELECT key FROM {self.table} ORDER BY accessed_at DESC LIMIT ?
+                        )
+                        """,
+                        (self.max_entries,),
+                    )
+        except sqlite3.Error as e:
+            print(f"Error writing cache {self.table}: {e}")
+
+    def purge_expired(self) -> int:
+        """
+        Deletes every expired entry from the cache.
+
+        Returns:
+            int: The number of deleted entries.
+        """
+        if self.ttl is None:
+            return 0
+        with self._connect() as conn:
+            cursor = conn.execute(
+                f"DELETE FROM {self.table} WHERE created_at < ?", (time.time() - self.ttl,)
+            )
+            return cursor.rowcount
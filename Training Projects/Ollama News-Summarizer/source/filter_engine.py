@@ -1,7 +1,59 @@
-from typing import List, Dict
+from typing import Callable, List, Dict, Optional, Pattern, Tuple
 from datetime import datetime, timedelta
+from functools import lru_cache
+import heapq
+import math
+import re
 import pytz
 
+# Keywords and synonyms for each interest. A trailing "*" marks a word prefix, so
+# "politic*" matches "politics" and "political"; other keywords must match whole words.
+INTEREST_KEYWORDS = {
+    "politics": ["politic*", "election*", "government*", "parliament*", "legislat*", "minister*", "premier",
+                 "mayor*", "council*", "senat*", "congress*", "campaign*", "ballot*", "voter*", "policy", "policies"],
+    "technology": ["tech*", "software", "hardware", "computer*", "smartphone*", "internet", "cyber*",
+                   "artificial intelligence", "AI", "robot*", "startup*", "app", "apps", "digital", "semiconductor*"],
+    "sports": ["sport*", "hockey", "football", "soccer", "basketball", "baseball", "tennis", "golf*",
+               "olympic*", "athlet*", "playoff*", "tournament*", "championship*", "NHL", "NFL", "NBA", "MLB", "CFL"],
+    "weather": ["weather", "forecast*", "storm*", "snow*", "rain", "rainfall", "wildfire*", "temperature*",
+                "heat wave*", "heatwave*", "flood*", "tornado*", "hurricane*", "blizzard*", "drought*", "climate"],
+    "education": ["education*", "school*", "student*", "teacher*", "universit*", "college*", "campus*",
+                  "classroom*", "tuition", "curricul*"],
+    "health": ["health*", "hospital*", "medical", "medicine*", "doctor*", "nurse*", "patient*", "disease*",
+               "vaccin*", "virus*", "pandemic*", "mental health", "clinic*", "cancer*"],
+    "business": ["business*", "econom*", "market*", "stock*", "compan*", "industr*", "trade", "trading",
+                 "financ*", "bank*", "invest*", "inflation", "interest rate*", "retail*", "earnings", "jobs"],
+    "entertainment": ["entertainment", "movie*", "film*", "music*", "concert*", "celebrit*", "television",
+                      "TV", "festival*", "theatre*", "theater*", "album*", "box office", "Netflix"],
+}
+
+@lru_cache(maxsize=64)
+def compile_interest_pattern(interests: Tuple[str, ...]) -> Optional[Pattern]:
+    """
+    Compiles a single case-insensitive regular expression that matches any keyword of
+    the given interests on word boundaries. Patterns are cached per set of interests.
+
+    Args:
+        interests (Tuple[str, ...]): The interests to match, in a canonical order.
+
+    Returns:
+        Optional[Pattern]: The compiled pattern, or None if there are no interests.
+    """
+    keywords = set()
+    for interest in interests:
+        # Interests without a keyword list are matched on their own name
+        keywords.update(INTEREST_KEYWORDS.get(interest.lower(), [interest]))
+
+    if not keywords:
+        return None
+
+    # Longest keywords first so the alternation prefers the most specific match
+    alternatives = [
+        re.escape(keyword[:-1]) + r"\w*" if keyword.endswith("*") else re.escape(keyword)
+        for keyword in sorted(keywords, key=len, reverse=True)
+    ]
+    return re.compile(rf"\b(?:{'|'.join(alternatives)})\b", re.IGNORECASE)
+
 class ArticleFilter:
     """
     This class handles filtering news articles based on their publication time
@@ -9,20 +61,33 @@ class ArticleFilter:
     such as "today", "week", and "month".
     """
     
-    def __init__(self):
+    def __init__(
+            self,
+            embed_fn: Optional[Callable[[List[str]], List[List[float]]]] = None,
+            similarity_threshold: float = 0.5,
+    ):
         """
         Initializes the ArticleFilter object by setting the timezone to UTC and
-        defining the time-based filters for articles. It also sets the current time
-        for comparison during filtering.
+        defining the time ranges used to filter articles. The current time is read
+        on every call to filter_articles, so long-lived instances stay correct.
+
+        Args:
+            embed_fn (Optional[Callable[[List[str]], List[List[float]]]]): Optional function that
+                embeds a list of texts. When given, articles without a keyword match are kept if
+                their embedding is similar enough to one of the interests.
+            similarity_threshold (float): Minimum cosine similarity for the embedding-based match.
         """
+        self.embed_fn = embed_fn
+        self.similarity_threshold = similarity_threshold
+        self._interest_embeddings = {}
+
         self.timezone = pytz.UTC  # Set the timezone to UTC
-        now = datetime.now(self.timezone)  # Get current UTC time
 
-        # Define filters for different time ranges
-        self.time_filters = {
-            "today": lambda x: self._to_utc(x["published"]).date() == now.date(),
-            "week": lambda x: self._to_utc(x["published"]) >= now - timedelta(days=7),
-            "month": lambda x: self._to_utc(x["published"]) >= now - timedelta(days=30),
+        # Define how far back each time range reaches ("today" starts at midnight UTC)
+        self.time_ranges = {
+            "today": None,
+            "week": timedelta(days=7),
+            "month": timedelta(days=30),
         }
 
     def _to_utc(self, dt: datetime) -> datetime:
@@ -41,6 +106,72 @@ class ArticleFilter:
         # If datetime is already timezone-aware, convert it to UTC
         return dt.astimezone(self.timezone)
     
+    def _get_time_window(self, time_range: str, now: datetime) -> Tuple[datetime, Optional[datetime]]:
+        """
+        Computes the publication time window for a time range.
+
+        Args:
+            time_range (str): The time range, one of "today", "week" or "month".
+                Unknown values fall back to "week".
+            now (datetime): The current UTC time.
+
+        Returns:
+            Tuple[datetime, Optional[datetime]]: The start of the window, and its end
+            for "today" (next midnight) or None if the window is open-ended.
+        """
+        if time_range == "today":
+            start = now.replace(hour=0, minute=0, second=0, microsecond=0)
+            return start, start + timedelta(days=1)
+        return now - self.time_ranges.get(time_range, self.time_ranges["week"]), None
+
+    def _cosine_similarity(self, a: List[float], b: List[float]) -> float:
+        """
+        Computes the cosine similarity of two vectors.
+
+        Args:
+            a (List[float]): The first vector.
+            b (List[float]): The second vector.
+
+        Returns:
+            float: The cosine similarity, or 0.0 if either vector is zero.
+        """
+        norm = math.sqrt(sum(x * x for x in a)) * math.sqrt(sum(y * y for y in b))
+        return sum(x * y for x, y in zip(a, b)) / norm if norm else 0.0
+
+    def _match_by_embedding(self, articles: List[Dict], interests: List[str]) -> List[Dict]:
+        """
+        Keeps the articles whose embedding is close to the embedding of one of the interests.
+        Interest embeddings are computed once and reused, and all articles are embedded in
+        a single call.
+
+        Args:
+            articles (List[Dict]): Articles that had no keyword match.
+            interests (List[str]): The user's interests.
+
+        Returns:
+            List[Dict]: The articles that match an interest by topic.
+        """
+        if not articles or not interests:
+            return []
+
+        try:
+            missing = [interest for interest in interests if interest not in self._interest_embeddings]
+            if missing:
+                for interest, vector in zip(missing, self.embed_fn([f"News about {i}" for i in missing])):
+                    self._interest_embeddings[interest] = vector
+
+            vectors = self.embed_fn([f"{a['title']} {a.get('summary', '')}" for a in articles])
+        except Exception as e:
+            print(f"Error scoring articles by embedding: {e}")
+            return []
+
+        interest_vectors = [self._interest_embeddings[interest] for interest in interests]
+        return [
+            article
+            for article, vector in zip(articles, vectors)
+            if max(self._cosine_similarity(vector, iv) for iv in interest_vectors) >= self.similarity_threshold
+        ]
+
     def filter_articles(
             self,
             articles: List[Dict],
@@ -62,20 +193,33 @@ class ArticleFilter:
             List[Dict]: A list of filtered articles.
         """
         
-        # Step 1: Filter articles by time range
-        time_filter = self.time_filters.get(time_range, self.time_filters["week"])
-        time_filtered = [article for article in articles if time_filter(article)]
+        # Step 1: Filter articles by a time window computed for this call
+        start, end = self._get_time_window(time_range, datetime.now(self.timezone))
 
-        # Step 2: Filter articles by user interests
+        time_filtered = []
+        for article in articles:
+            # Normalize the timestamp once so the later steps compare plain UTC datetimes
+            published = article["published"] = self._to_utc(article["published"])
+            if published >= start and (end is None or published < end):
+                time_filtered.append(article)
+
+        # Step 2: Filter articles by user interests with one precompiled pattern
+        pattern = compile_interest_pattern(tuple(sorted(set(interests))))
         interest_filtered = []
+        unmatched = []
         for article in time_filtered:
             # Combine title and summary content to check for user interests
-            content = f"{article['title']} {article['summary']}".lower()
+            content = f"{article['title']} {article['summary']}"
+
+            if pattern is None or pattern.search(content):
+                interest_filtered.append(article)
+            else:
+                unmatched.append(article)
 
-            # The following line is commented out; it was originally used to filter by interests
-            # if any(interest.lower() in content for interest in interests):
-            interest_filtered.append(article)
+        # Optionally rescue articles that are on topic without using any of the keywords
+        if self.embed_fn is not None:
+            interest_filtered.extend(self._match_by_embedding(unmatched, interests))
 
-        # Step 3: Sort articles by publication date (most recent first)
-        # Return the filtered articles, limited by max_articles
-        return sorted(interest_filtered, key=lambda x: x["published"], reverse=True)[:max_articles]
+        # Step 3: Select the max_articles most recent articles with a bounded heap,
+        # which avoids sorting the whole list (most recent first)
+        return heapq.nlargest(max_articles, interest_filtered, key=lambda x: x["published"])
@@ -0,0 +1,124 @@
+import hashlib
+import re
+import threading
+from collections import OrderedDict
+from typing import Iterable, Optional
+from langdetect import DetectorFactory, detect, LangDetectException
+
+# Make langdetect deterministic for the few titles that still need it
+DetectorFactory.seed = 0
+
+# Short lists of very common function words, used as a compact word n-gram model. Words
+# that are also common in English headlines ("no", "do", "die", "van", "plus", ...) are
+# left out of the other languages, so they can't count against an English title
+STOPWORDS = {
+    "en": {"the", "of", "and", "to", "in", "a", "for", "on", "with", "is", "are", "was", "were", "at", "by",
+           "from", "after", "as", "over", "says", "said", "will", "has", "have", "had", "be", "been", "an",
+           "its", "it", "that", "this", "how", "why", "what", "who", "when", "where", "which", "more", "up",
+           "out", "into", "about", "new", "could", "would", "amid", "than", "no", "not", "do", "does", "did",
+           "but", "or", "if", "he", "she", "they", "we", "you", "his", "her", "their", "our", "your", "can",
+           "may", "should", "near", "under", "against", "during", "before", "while", "off", "down", "two"},
+    "fr": {"le", "la", "les", "des", "du", "et", "est", "une", "dans", "sur", "au", "aux", "avec", "qui",
+           "pas", "ce", "cette", "selon", "sont", "leur"},
+    "es": {"el", "la", "los", "las", "del", "y", "es", "una", "por", "para", "se", "su", "como", "más",
+           "sus", "pero", "fue"},
+    "de": {"der", "das", "und", "ist", "nicht", "mit", "von", "dem", "ein", "eine", "für", "auf", "zu",
+           "bei", "nach", "sich", "wird", "auch"},
+    "it": {"il", "la", "gli", "della", "delle", "di", "che", "è", "sono", "nel", "alla", "dei", "anche",
+           "più"},
+    "pt": {"os", "das", "dos", "na", "em", "uma", "não", "são", "ao", "mais"},
+    "nl": {"het", "een", "en", "te", "niet", "voor", "zijn", "dat", "naar", "ook", "bij"},
+}
+
+# How many more function words another language needs than English before a title is
+# rejected outright; closer calls are left to langdetect
+MIN_MARGIN = 2
+
+class LanguageFilter:
+    """
+    This class decides whether a piece of text, typically an article title, is English.
+    Most titles are settled quickly and deterministically by their alphabet and by
+    counting common function words of a few languages; titles where no language wins
+    by a clear margin fall back to langdetect. Results are cached per title hash in a cache shared by all
+    instances, and articles from sources trusted to publish in English skip detection entirely.
+    """
+
+    # Detection results shared by every instance, since the app creates a new fetcher on each rerun
+    cache = OrderedDict()
+    lock = threading.Lock()
+
+    def __init__(self, trusted_sources: Optional[Iterable[str]] = None, cache_size: int = 10000):
+        """
+        Initializes the LanguageFilter.
+
+        Args:
+            trusted_sources (Optional[Iterable[str]]): Source names whose articles are always English.
+            cache_size (int): Maximum number of cached detection results.
+        """
+        self.trusted_sources = {source.lower() for source in trusted_sources or []}
+        self.cache_size = cache_size
+
+    def is_english(self, text: str, source: Optional[str] = None) -> bool:
+        """
+        Checks whether a text is English.
+
+        Args:
+            text (str): The text to check.
+            source (Optional[str]): Name of the source that published the text.
+
+        Returns:
+            bool: True if the text is English or comes from a trusted source.
+        """
+        if source and source.lower() in self.trusted_sources:
+            return True
+
+        key = hashlib.blake2b(text.encode("utf-8"), digest_size=16).digest()
+        with self.lock:
+            if key in self.cache:
+                self.cache.move_to_end(key)
+                return self.cache[key]
+
+        result = self._detect_english(text)
+
+        with self.lock:
+            self.cache[key] = result
+            # Drop the least recently used result once the cache is full
+            if len(self.cache) > self.cache_size:
+                self.cache.popitem(last=False)
+        return result
+
+    def _detect_english(self, text: str) -> bool:
+        """
+        Detects whether a text is English without using the cache.
+
+        Args:
+            text (str): The text to check.
+
+        Returns:
+            bool: True if the text is detected as English.
+        """
+        letters = [char for char in text if char.isalpha()]
+        if not letters:
+            return False
+
+        # Mostly non-Latin letters (Cyrillic, CJK, Arabic, ...) can't be English
+        non_latin = sum(1 for char in letters if ord(char) > 0x24F)
+        if non_latin / len(letters) > 0.3:
+            return False
+
+        # Count the function words of each language found in the text
+        words = re.findall(r"[^\W\d_]+", text.lower())
+        scores = {language: sum(word in stopwords for word in words) for language, stopwords in STOPWORDS.items()}
+        english = scores.pop("en")
+        other = max(scores.values())
+
+        if english > other:
+            return True
+        if other - english >= MIN_MARGIN:
+            return False
+
+        # Ambiguous titles, e.g. "Oilers beat Flames 4-2", fall back to langdetect
+        try:
+            return detect(text) == "en"
+        except LangDetectException:
+            return False
@@ -1,7 +1,22 @@
 import geocoder
-from typing import Tuple, Dict, Optional
+from typing import Tuple, Dict, Optional, Union
 import json
 import os
+import tempfile
+import threading
+import time
+
+# Cache key of the location looked up from the current IP address
+IP_CACHE_KEY = "ip:me"
+
+# Location used when no address is given and IP lookup is off or fails
+DEFAULT_LOCATION = {
+    "city": "Edmonton",  # Default city
+    "state": "AB",       # Default state/province
+    "country": "Canada", # Default country
+    "lat": 53.55014,     # Default latitude
+    "lng": -113.46871,   # Default longitude
+}
 
 class LocationService:
     """
@@ -10,49 +25,212 @@ class LocationService:
     the location information to avoid repeated geolocation lookups.
     """
 
-    def __init__(self) -> None:
+    # In-memory copies of the cache files by path, shared by every instance and Streamlit session
+    caches = {}
+    cache_mtimes = {}
+    lock = threading.Lock()
+
+    def __init__(
+            self,
+            cache_file: str = "config/location_cache.json",
+            ttl: float = 24 * 3600,
+            fallback_ttl: float = 300,
+            use_ip_location: bool = False,
+    ) -> None:
         """
         Initializes the LocationService object. Sets up the cache file path for storing
         previously fetched location data.
+
+        Args:
+            cache_file (str): Path to the JSON file the location cache is persisted to.
+            ttl (float): Seconds a cached location is reused before it is looked up again.
+            fallback_ttl (float): Seconds the default location is reused after a failed lookup.
+            use_ip_location (bool): Whether to look up the location of the current IP address when
+                no address is given. Off by default: it costs a network call, and on a server it
+                finds the server's location rather than the user's.
+        """
+        self.cache_file = cache_file
+        self.cache_path = os.path.abspath(cache_file)
+        self.ttl = ttl
+        self.fallback_ttl = fallback_ttl
+        self.use_ip_location = use_ip_location
+
+    @property
+    def cache(self) -> Dict:
         """
-        self.cache_file = "config/location_cache.json"
+        The in-memory copy of this instance's cache file. Must be used with `self.lock` held.
+
+        Returns:
+            Dict: The cache entries by key.
+        """
+        return LocationService.caches[self.cache_path]
 
     def _load_cache(self):
         """
-        Loads the location cache from a file if it exists. This cache stores previously
-        fetched location data to avoid unnecessary repeated geolocation lookups.
+        Loads the location cache from a file if it exists and has changed since it was
+        last read. This cache stores previously fetched location data to avoid unnecessary
+        repeated geolocation lookups. Must be called with `self.lock` held.
 
         Returns:
-            None: Updates the `self.cache` attribute with the loaded cache data.
+            None: Updates the shared in-memory copy of this cache file.
         """
-        if os.path.exists(self.cache_file):
-            # Load the cached location data from the file
-            with open(self.cache_file, 'r') as f:
-                self.cache = json.load(f)
-        else:
-            # Initialize an empty cache if the cache file doesn't exist
-            self.cache = {}
+        try:
+            mtime = os.path.getmtime(self.cache_file)
+        except OSError:
+            mtime = None
+
+        # Nothing to do if the file hasn't changed since it was loaded
+        if self.cache_path in LocationService.caches and mtime == LocationService.cache_mtimes.get(self.cache_path):
+            return
+
+        cache = {}
+        if mtime is not None:
+            try:
+                # Load the cached location data from the file
+                with open(self.cache_file, 'r') as f:
+                    data = json.load(f)
+                # Keep only timestamped entries; older files stored a single untimed "last_location"
+                cache = {
+                    key: entry for key, entry in data.items()
+                    if isinstance(entry, dict) and "location" in entry and "timestamp" in entry
+                }
+            except (OSError, ValueError, AttributeError) as e:
+                print(f"Error loading location cache: {e}")
+
+        LocationService.caches[self.cache_path] = cache
+        LocationService.cache_mtimes[self.cache_path] = mtime
 
     def _save_cache(self):
         """
-        Saves the current cache to the cache file. This ensures that cached location data
-        persists between application restarts.
+        Saves the current cache to the cache file. The data is written to a temporary file
+        which then replaces the cache file, so readers never see a partially written file.
+        Must be called with `self.lock` held.
 
         Returns:
-            None: Writes the current `self.cache` data to the cache file.
+            None: Writes the current `cache` data to the cache file.
         """
         # Ensure the config directory exists before saving the cache
-        os.makedirs("config", exist_ok=True)
-        
-        # Save the cache data to the JSON file
-        with open(self.cache_file, "w") as f:
-            json.dump(self.cache, f)
+        directory = os.path.dirname(self.cache_file) or "."
+        os.makedirs(directory, exist_ok=True)
+
+        try:
+            fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+            with os.fdopen(fd, "w") as f:
+                json.dump(self.cache, f)
+            os.replace(tmp_path, self.cache_file)
+            LocationService.cache_mtimes[self.cache_path] = os.path.getmtime(self.cache_file)
+        except OSError as e:
+            print(f"Error saving location cache: {e}")
+
+    def _get_cached(self, key: str) -> Optional[Dict]:
+        """
+        Retrieves a location from the cache if it hasn't expired.
+
+        Args:
+            key (str): The cache key.
+
+        Returns:
+            Optional[Dict]: The cached location, or None if it is missing or expired.
+        """
+        with self.lock:
+            self._load_cache()
+            entry = self.cache.get(key)
+        if entry and time.time() - entry["timestamp"] <= entry.get("ttl", self.ttl):
+            return dict(entry["location"])
+        return None
+
+    def _set_cached(self, key: str, location: Dict, ttl: Optional[float] = None):
+        """
+        Stores a location in the cache and persists it.
+
+        Args:
+            key (str): The cache key.
+            location (Dict): The location to store.
+            ttl (Optional[float]): Time-to-live of this entry, if different from the default.
+        """
+        entry = {"location": location, "timestamp": time.time()}
+        if ttl is not None:
+            entry["ttl"] = ttl
+        with self.lock:
+            self._load_cache()
+            self.cache[key] = entry
+            self._save_cache()
+
+    def _parse_address(self, address: Dict) -> Dict:
+        """
+        Extracts the city, state and country from an address dictionary.
+
+        Args:
+            address (Dict): A dictionary containing address components like 
+            city, state, and country.
+
+        Returns:
+            Dict: A dictionary containing city, state and country.
+        """
+        city = (
+            address.get("city") or
+            address.get("town") or
+            address.get("village") or
+            address.get("municipality") or
+            address.get("hamlet") or
+            address.get("locality") or
+            ""
+        )
+        state = address.get("state") or address.get("province") or ""
+        country = address.get("country") or ""
+
+        return {
+            "city": city,
+            "state": state,
+            "country": country,
+            # "lat": user_override.get("lat", None),  # Latitude is not currently used
+            # "lng": user_override.get("lng", None),  # Longitude is not currently used
+        }
+
+    def _lookup_ip_location(self) -> Optional[Dict]:
+        """
+        Looks up the location of the current IP address.
+
+        Returns:
+            Optional[Dict]: The location, or None if the lookup fails.
+        """
+        try:
+            g = geocoder.ip("me")
+        except Exception as e:
+            print(f"Error during IP geolocation: {e}")
+            return None
+
+        if not g.ok or not g.city:
+            return None
+
+        lat, lng = g.latlng if g.latlng else (None, None)
+        return {
+            "city": g.city,
+            "state": g.state or "",
+            "country": g.country or "",
+            "lat": lat,
+            "lng": lng,
+        }
+
+    def _address_key(self, address: Union[Dict, str]) -> str:
+        """
+        Builds the cache key of an address from its normalized text.
+
+        Args:
+            address (Union[Dict, str]): An address dictionary or address text.
+
+        Returns:
+            str: The cache key.
+        """
+        if isinstance(address, dict):
+            address = ", ".join(str(value) for value in address.values() if value)
+        return f"address:{address.strip().lower()}"
 
     def get_location(self, address: Optional[Dict] = None) -> Dict:
         """
         Retrieves location information based on a given address dictionary or falls back
-        to IP-based geolocation if no address is provided. It can also return a cached
-        location if available.
+        to a default location (or, if enabled, IP-based geolocation) if no address is
+        provided. Locations are cached by normalized address or IP.
 
         Args:
             address (Optional[Dict]): A dictionary containing address components like 
@@ -62,37 +240,32 @@ class LocationService:
             Dict: A dictionary containing location information including city, state,
             country, and optionally latitude and longitude.
         """
-        # If an address is provided, extract relevant location details
+        # If an address is provided, extract relevant location details; this needs no lookup
         if address:
-            city = (
-                address.get("city") or
-                address.get("town") or
-                address.get("village") or
-                address.get("municipality") or
-                address.get("hamlet") or
-                address.get("locality") or
-                ""
-            )
-            state = address.get("state") or address.get("province") or ""
-            country = address.get("country") or ""
-            
-            # Return the extracted location information as a dictionary
-            return {
-                "city": city,
-                "state": state,
-                "country": country,
-                # "lat": user_override.get("lat", None),  # Latitude is not currently used
-                # "lng": user_override.get("lng", None),  # Longitude is not currently used
-            }
-        
-        # Fallback: Return a hardcoded location if no address is provided or geolocation fails
-        location = {
-            "city": "Edmonton",  # Default city
-            "state": "AB",       # Default state/province
-            "country": "Canada", # Default country
-            "lat": 53.55014,     # Default latitude
-            "lng": -113.46871,   # Default longitude
-        }
+            key = self._address_key(address)
+            location = self._get_cached(key)
+            if location is None:
+                location = self._parse_address(address)
+                self._set_cached(key, location)
+            return location
+
+        # Without IP lookup the default location is returned without any I/O, as before
+        if not self.use_ip_location:
+            return dict(DEFAULT_LOCATION)
+
+        # Reuse the cached IP location so reruns never hit the network
+        location = self._get_cached(IP_CACHE_KEY)
+        if location:
+            return location
+
+        location = self._lookup_ip_location()
+        if location:
+            self._set_cached(IP_CACHE_KEY, location)
+            return location
+
+        # Remember the fallback briefly so a failing lookup isn't retried on every rerun
+        location = dict(DEFAULT_LOCATION)
+        self._set_cached(IP_CACHE_KEY, location, ttl=self.fallback_ttl)
 
         # Return the fallback location
         return location
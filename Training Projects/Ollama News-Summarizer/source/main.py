@@ -37,11 +37,11 @@ def main():
         articles, preferences["interests"]
     )
 
-    # Generate summaries for each filtered article and print them
-    for article in filtered_articles:
-        # Generate a summary for the current article
-        summary = summarizer.generate_summary(article)
-        
+    # Generate the summaries in batches, packing several articles into each request
+    summaries = summarizer.generate_summaries(filtered_articles)
+
+    # Print each filtered article with its summary
+    for article, summary in zip(filtered_articles, summaries):
         # Print the article's title, source, summary, and link in a readable format
         print(f"\nTitle: {article['title']}")
         print(f"Source: {article['source']}")
@@ -1,14 +1,31 @@
 import json
-from typing import List, Dict
+import hashlib
+import random
+from collections import defaultdict
+from typing import List, Dict, Optional, Set, Tuple
 from datetime import datetime
 from dateutil import parser
 import requests
 import re
 import os
-from time import sleep
-from random import uniform
+import threading
+from concurrent.futures import ThreadPoolExecutor
 import pytz
-from langdetect import detect, LangDetectException
+from language_filter import LanguageFilter
+from rate_limiter import TokenBucket
+from cache_store import SQLiteCache
+
+# MinHash settings for near-duplicate detection: NUM_BANDS bands of ROWS_PER_BAND hashes each
+NUM_BANDS = 8
+ROWS_PER_BAND = 4
+MERSENNE_PRIME = (1 << 61) - 1
+
+# Fixed seed so every process computes the same signatures
+_rng = random.Random(42)
+MINHASH_PARAMS = [
+    (_rng.randrange(1, MERSENNE_PRIME), _rng.randrange(0, MERSENNE_PRIME))
+    for _ in range(NUM_BANDS * ROWS_PER_BAND)
+]
 
 class NewsFetcher:
     """
@@ -18,13 +35,35 @@ class NewsFetcher:
     based on user preferences and location.
     """
 
-    def __init__(self, feeds_file: str = "config/news_sources.json"):
+    # GNews rate limiters shared by every instance, keyed by (rate, burst), since the app
+    # creates a new fetcher on each rerun and session but the quota is per process
+    rate_limiters = {}
+    rate_limiters_lock = threading.Lock()
+
+    def __init__(
+            self,
+            feeds_file: str = "config/news_sources.json",
+            requests_per_second: float = 1.0,
+            burst: int = 5,
+            max_workers: int = 5,
+            cache_ttl: float = 1800,
+            detect_language: bool = True,
+            trusted_sources: Optional[List[str]] = None,
+    ):
         """
         Initializes the NewsFetcher instance. Ensures the config directory exists 
         and creates a default configuration for news sources if it doesn't exist.
 
         Args:
             feeds_file (str): Path to the news sources configuration file.
+            requests_per_second (float): Sustained GNews request rate allowed by the rate limiter.
+            burst (int): Number of GNews requests that may be sent at once.
+            max_workers (int): Maximum number of queries fetched concurrently.
+            cache_ttl (float): Seconds a cached GNews response is served before it is re-fetched.
+            detect_language (bool): Whether to check that article titles are English. The
+                request already asks GNews for English articles, so this can be turned off.
+            trusted_sources (Optional[List[str]]): Source names known to publish in English,
+                whose articles skip language detection.
         """
         # Ensure the config directory exists
         os.makedirs("config", exist_ok=True)
@@ -41,6 +80,35 @@ class NewsFetcher:
         # Get the GNews API key from environment variables
         self.gnews_api_key = os.getenv("GNEWS_API_KEY", "")
 
+        # Rate limiter shared by every GNews request made in this process
+        self.rate_limiter = self._get_rate_limiter(requests_per_second, burst)
+        self.max_workers = max_workers
+
+        # Persistent response cache shared by every session and process, to save the free-tier quota
+        self.cache = SQLiteCache("config/news_cache.sqlite", table="gnews_responses", ttl=cache_ttl)
+
+        # Fast, cached language detection for article titles
+        self.detect_language = detect_language
+        self.language_filter = LanguageFilter(trusted_sources=trusted_sources)
+
+    @classmethod
+    def _get_rate_limiter(cls, requests_per_second: float, burst: int) -> TokenBucket:
+        """
+        Returns the process-wide rate limiter for the given settings, creating it on first use.
+
+        Args:
+            requests_per_second (float): Sustained GNews request rate allowed by the rate limiter.
+            burst (int): Number of GNews requests that may be sent at once.
+
+        Returns:
+            TokenBucket: The rate limiter shared by every fetcher with these settings.
+        """
+        with cls.rate_limiters_lock:
+            key = (requests_per_second, burst)
+            if key not in cls.rate_limiters:
+                cls.rate_limiters[key] = TokenBucket(rate=requests_per_second, capacity=burst)
+            return cls.rate_limiters[key]
+
     def _fetch_gnews_news(self, query: str) -> List[Dict]:
         """
         Fetch news articles from the GNews API based on a search query.
@@ -64,12 +132,24 @@ class NewsFetcher:
                 "country": "ca",
             }
 
-            response = requests.get(url, params=params)
-            if response.status_code != 200:
-                print(f"Failed to fetch news: {response.status_code} {response.text}")
-                return []
+            # The API token is left out of the key so it can be rotated without losing the cache
+            cache_key = self.cache.make_key(url, {k: v for k, v in params.items() if k != "token"})
+            data = self.cache.get(cache_key)
+
+            if data is None:
+                # Wait for a token instead of sleeping blindly between queries
+                self.rate_limiter.acquire()
+                response = requests.get(url, params=params, timeout=10)
+                if response.status_code != 200:
+                    print(f"Failed to fetch news: {response.status_code} {response.text}")
+                    # Serve an expired response rather than nothing, e.g. once the daily quota is used up
+                    data = self.cache.get(cache_key, allow_stale=True)
+                    if data is None:
+                        return []
+                else:
+                    data = response.json()
+                    self.cache.set(cache_key, data)
 
-            data = response.json()
             # Parse the returned data and extract article information
             for item in data.get("articles", []):
                 title = item.get("title", "")
@@ -84,12 +164,10 @@ class NewsFetcher:
                     # If parsing fails, set the current UTC time as the published date
                     published = datetime.now(self.timezone)
 
-                try:
-                    # Skip non-English articles using the language detection library
-                    if detect(title) != "en":
-                        continue
-                except LangDetectException:
-                    # In case language detection fails, skip the article
+                source = item.get("source", {}).get("name", "GNews")
+
+                # Skip non-English articles; results are cached and trusted sources are not checked
+                if self.detect_language and not self.language_filter.is_english(title, source):
                     continue
                 
                 if title and link:
@@ -98,7 +176,7 @@ class NewsFetcher:
                         "summary": snippet,
                         "link": link,
                         "published": published,
-                        "source": item.get("source", {}).get("name", "GNews"),
+                        "source": source,
                         "category": "general"
                     })
 
@@ -145,12 +223,33 @@ class NewsFetcher:
         state = location["state"]
         return f"{city} {state} local news"
 
-    def fetch_news(self, location: Dict) -> List[Dict]:
+    def _fetch_queries(self, queries: List[str], concurrent: bool = True) -> List[Dict]:
+        """
+        Fetch several GNews queries, either concurrently on a thread pool or one after
+        another. In both modes the shared token bucket keeps requests within the rate limit.
+
+        Args:
+            queries (List[str]): The search queries to fetch.
+            concurrent (bool): Whether to send the queries concurrently. Defaults to True.
+
+        Returns:
+            List[Dict]: The fetched articles, in the same order as the queries.
+        """
+        if not concurrent or len(queries) < 2:
+            results = [self._fetch_gnews_news(query) for query in queries]
+        else:
+            with ThreadPoolExecutor(max_workers=min(self.max_workers, len(queries))) as executor:
+                results = list(executor.map(self._fetch_gnews_news, queries))
+
+        return [article for result in results for article in result]
+
+    def fetch_news(self, location: Dict, concurrent: bool = True) -> List[Dict]:
         """
         Fetch news articles using location-specific and default queries.
 
         Args:
             location (Dict): A dictionary containing city and state information.
+            concurrent (bool): Whether to fetch the default feeds concurrently. Defaults to True.
 
         Returns:
             List[Dict]: A list of sorted and unique articles retrieved from the GNews API.
@@ -161,7 +260,6 @@ class NewsFetcher:
         try:
             location_query = self._get_location_query(location)
             articles.extend(self._fetch_gnews_news(location_query))
-            sleep(uniform(1, 2))  # Adding a delay to avoid hitting rate limits
         except Exception as e:
             print(f"Error fetching location-specific news: {str(e)}")
 
@@ -169,10 +267,8 @@ class NewsFetcher:
         if len(articles) < 10:
             try:
                 default_feeds = self._get_default_feeds()["default"]
-                for feed in default_feeds:
-                    query = feed["query"]
-                    articles.extend(self._fetch_gnews_news(query))
-                    sleep(uniform(1, 2))  # Adding a delay between queries
+                queries = [feed["query"] for feed in default_feeds]
+                articles.extend(self._fetch_queries(queries, concurrent=concurrent))
             except Exception as e:
                 print(f"Error fetching default news: {str(e)}")
 
@@ -182,23 +278,87 @@ class NewsFetcher:
 
         return sorted_articles
 
-    def _remove_duplicates(self, articles: List[Dict]) -> List[Dict]:
+    def _tokens(self, text: str) -> Set[str]:
         """
-        Removes duplicate articles based on title similarity.
+        Splits a text into its set of lowercase words.
+
+        Args:
+            text (str): The text to split.
+
+        Returns:
+            Set[str]: The distinct words of the text.
+        """
+        return set(re.findall(r"[a-z0-9]+", text.lower())) or {""}
+
+    def _minhash_signature(self, tokens: Set[str]) -> Tuple[int, ...]:
+        """
+        Computes the MinHash signature of a set of words. The share of equal values in
+        two signatures estimates the Jaccard similarity of the two word sets.
+
+        Args:
+            tokens (Set[str]): The words to fingerprint.
+
+        Returns:
+            Tuple[int, ...]: One minimum hash value per hash function.
+        """
+        token_hashes = [
+            int.from_bytes(hashlib.blake2b(token.encode("utf-8"), digest_size=8).digest(), "big")
+            for token in tokens
+        ]
+        return tuple(
+            min((a * token_hash + b) % MERSENNE_PRIME for token_hash in token_hashes)
+            for a, b in MINHASH_PARAMS
+        )
+
+    def _remove_duplicates(self, articles: List[Dict], similarity_threshold: float = 0.7) -> List[Dict]:
+        """
+        Removes duplicate and near-duplicate articles, such as syndicated copies of the same
+        story with slightly different headlines. Locality-sensitive hashing on bands of
+        MinHash signatures of the title and snippet finds likely candidates in linear time,
+        and each candidate is then confirmed with the exact word overlap of the two
+        articles, since the signature's estimate is too noisy to drop articles on its own.
+        The first article of each cluster of near-duplicates is kept.
 
         Args:
             articles (List[Dict]): A list of articles.
+            similarity_threshold (float): Word overlap (Jaccard similarity) at or above
+                which two articles are treated as the same story. Defaults to 0.7.
 
         Returns:
             List[Dict]: A list of unique articles.
         """
         seen_titles = set()
+        buckets = defaultdict(list)
         unique_articles = []
+        # Word sets of the kept articles, by position in unique_articles
+        kept_tokens = []
 
         for article in articles:
+            # Exact title matches are dropped without computing a signature
             title_key = article["title"].lower()
-            if title_key not in seen_titles:
-                seen_titles.add(title_key)
-                unique_articles.append(article)
+            if title_key in seen_titles:
+                continue
+
+            tokens = self._tokens(f"{article['title']} {article.get('summary', '')}")
+            signature = self._minhash_signature(tokens)
+            bands = [
+                (band, signature[band * ROWS_PER_BAND:(band + 1) * ROWS_PER_BAND])
+                for band in range(NUM_BANDS)
+            ]
+
+            # Only articles sharing at least one band are compared, on their exact word overlap
+            candidates = {other for key in bands for other in buckets[key]}
+            is_duplicate = any(
+                len(tokens & kept_tokens[other]) / len(tokens | kept_tokens[other]) >= similarity_threshold
+                for other in candidates
+            )
+            if is_duplicate:
+                continue
+
+            seen_titles.add(title_key)
+            for key in bands:
+                buckets[key].append(len(unique_articles))
+            unique_articles.append(article)
+            kept_tokens.append(tokens)
 
         return unique_articles
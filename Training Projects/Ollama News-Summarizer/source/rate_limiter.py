@@ -0,0 +1,48 @@
+import threading
+import time
+
+class TokenBucket:
+    """
+    This class implements a thread-safe token bucket rate limiter. Tokens are
+    refilled continuously at a fixed rate up to a maximum capacity, allowing short
+    bursts of requests while keeping the long-term request rate under the limit.
+    """
+
+    def __init__(self, rate: float = 1.0, capacity: int = 1):
+        """
+        Initializes the TokenBucket with a refill rate and a burst capacity.
+
+        Args:
+            rate (float): Number of tokens added to the bucket per second.
+            capacity (int): Maximum number of tokens the bucket can hold.
+        """
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = float(capacity)
+        self.last_refill = time.monotonic()
+        self.lock = threading.Lock()
+
+    def _refill(self):
+        """
+        Adds the tokens earned since the last refill, without exceeding the capacity.
+        """
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.last_refill) * self.rate)
+        self.last_refill = now
+
+    def acquire(self, tokens: int = 1):
+        """
+        Blocks until the requested number of tokens is available and consumes them.
+
+        Args:
+            tokens (int): Number of tokens to consume. Defaults to 1.
+        """
+        while True:
+            with self.lock:
+                self._refill()
+                if self.tokens >= tokens:
+                    self.tokens -= tokens
+                    return
+                # Work out how long until enough tokens have been refilled
+                wait_time = (tokens - self.tokens) / self.rate
+            time.sleep(wait_time)
@@ -1,11 +1,24 @@
 import nltk
+import json
+import hashlib
+import time
 import requests
+import threading
+from queue import Queue
 from nltk.tokenize import sent_tokenize
-from typing import Dict
+from typing import Dict, Iterator, List, Tuple
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 from openai import OpenAI
 from newspaper import Article
 from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
+from cache_store import SQLiteCache
+
+# Bump this whenever the summary prompt changes so old cached summaries are not reused
+PROMPT_VERSION = 1
+
+# System prompt shared by single and batch summary requests
+SYSTEM_PROMPT = """You are an expert news editor skilled at creating concise, informative summaries of local news articles. Focus on key facts and local impact while maintaining objectivity."""
 
 class NewsSummarizer:
     """
@@ -14,16 +27,58 @@ class NewsSummarizer:
     and ensures text extraction is robust by handling retries and SSL issues.
     """
 
-    def __init__(self, base_url: str = "http://localhost:11434/v1"):
+    def __init__(
+            self,
+            base_url: str = "http://localhost:11434/v1",
+            model: str = "llama3.2",
+            summary_cache_ttl: float = 7 * 24 * 3600,
+            max_cached_summaries: int = 5000,
+            max_connections_per_host: int = 4,
+            page_refresh_after: float = 24 * 3600,
+    ):
         """
         Initializes the NewsSummarizer class, setting up the OpenAI client
         and ensuring that necessary NLTK resources for tokenization are available.
 
         Args:
             base_url (str): Base URL for the OpenAI service.
+            model (str): Name of the model used to generate summaries.
+            summary_cache_ttl (float): Seconds a cached summary is reused. Defaults to one week.
+            max_cached_summaries (int): Number of summaries kept before the least recently used are evicted.
+            max_connections_per_host (int): Maximum number of open connections to a single news site.
+            page_refresh_after (float): Seconds before a cached page is revalidated with the server.
         """
-        # Initialize the OpenAI client (though it seems to be unused in this context)
+        # Initialize the OpenAI client used to generate the summaries
         self.client = OpenAI(base_url=base_url, api_key="ollama")
+        self.model = model
+
+        # Persistent summary store, so repeat views don't call the model again
+        self.summary_cache = SQLiteCache(
+            "config/summary_cache.sqlite",
+            table="summaries",
+            ttl=summary_cache_ttl,
+            max_entries=max_cached_summaries,
+        )
+
+        # Shared HTTP session that keeps TCP/TLS connections open between article downloads
+        self.session = requests.Session()
+        self.session.headers.update({'User-Agent': 'Mozilla/5.0'})
+
+        # Set up retries in case of failed connections, and block rather than open
+        # more than max_connections_per_host connections to the same site
+        retries = Retry(total=3, backoff_factor=0.3, status_forcelist=[500, 502, 503, 504])
+        adapter = HTTPAdapter(
+            pool_connections=20,
+            pool_maxsize=max_connections_per_host,
+            pool_block=True,
+            max_retries=retries,
+        )
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+        # Cache of parsed article text with the validators needed for conditional requests
+        self.page_refresh_after = page_refresh_after
+        self.page_cache = SQLiteCache("config/page_cache.sqlite", table="pages", ttl=None, max_entries=5000)
 
         # Ensure that the NLTK tokenizer resource is available
         try:
@@ -42,16 +97,13 @@ class NewsSummarizer:
         Returns:
             list: The message structure to send to the OpenAI API.
         """
-        # Extract the first few sentences from the article content for context
-        content = article["summary"]
-        sentences = sent_tokenize(content)
-        context = " ".join(sentences[:3])
+        context = self._get_context(article)
 
         # Return the message format that OpenAI will process
         return [
             {
                 "role": "system",
-                "content": """You are an expert news editor skilled at creating concise, informative summaries of local news articles. Focus on key facts and local impact while maintaining objectivity.""",
+                "content": SYSTEM_PROMPT,
             },
             {
                 "role": "user",
@@ -68,10 +120,108 @@ class NewsSummarizer:
             },
         ]
 
+    def _get_context(self, article: Dict) -> str:
+        """
+        Extract the first few sentences from the article content for context.
+
+        Args:
+            article (Dict): A dictionary representing the article to summarize.
+
+        Returns:
+            str: Up to the first three sentences of the article's content.
+        """
+        sentences = sent_tokenize(article["summary"])
+        return " ".join(sentences[:3])
+
+    def _create_batch_messages(self, articles: List[Dict]) -> list:
+        """
+        Create a single message payload that asks for summaries of several articles
+        at once, returned as JSON so each summary can be matched to its article.
+
+        Args:
+            articles (List[Dict]): The articles to summarize, numbered from 1 in the prompt.
+
+        Returns:
+            list: The message structure to send to the OpenAI API.
+        """
+        article_blocks = "\n\n                ".join(
+            f"""Article {number}:
+                Title: {article['title']}
+                Category: {article.get('category', 'general')}
+                Content: {self._get_context(article)}"""
+            for number, article in enumerate(articles, start=1)
+        )
+
+        return [
+            {
+                "role": "system",
+                "content": SYSTEM_PROMPT,
+            },
+            {
+                "role": "user",
+                "content": f"""Summarize each of these local news articles separately:
+
+                {article_blocks}
+
+                Format each summary as:
+                1. Main point (1 sentence)
+                2. Key details (1-2 sentences)
+                3. Local impact (1 sentence)
+
+                Respond with ONLY a JSON object of this form, with one entry per article:
+                {{"summaries": [{{"id": 1, "summary": "1. ...\\n2. ...\\n3. ..."}}]}}""",
+            },
+        ]
+
+    def _parse_batch_response(self, text: str, count: int) -> Dict[int, str]:
+        """
+        Parse and validate a batch summary response.
+
+        Args:
+            text (str): The raw model response.
+            count (int): The number of articles sent in the batch.
+
+        Returns:
+            Dict[int, str]: Valid summaries by article number. Articles with a missing or
+            malformed entry are left out.
+        """
+        try:
+            data = json.loads(text)
+        except (json.JSONDecodeError, TypeError):
+            return {}
+
+        summaries = {}
+        entries = data.get("summaries", []) if isinstance(data, dict) else []
+        for entry in entries if isinstance(entries, list) else []:
+            if not isinstance(entry, dict):
+                continue
+            number, summary = entry.get("id"), entry.get("summary")
+            # Keep only entries that refer to an article in this batch and contain a summary
+            if isinstance(number, int) and 1 <= number <= count and isinstance(summary, str) and summary.strip():
+                summaries[number] = summary.strip()
+        return summaries
+
+    def _summary_cache_key(self, article: Dict) -> str:
+        """
+        Build the cache key of an article's summary from its URL, a hash of the content
+        sent to the model, the model name and the prompt version.
+
+        Args:
+            article (Dict): A dictionary representing the article to summarize.
+
+        Returns:
+            str: The cache key for the article's summary.
+        """
+        content = f"{article['title']}\n{article.get('category', 'general')}\n{article['summary']}"
+        content_hash = hashlib.sha256(content.encode("utf-8")).hexdigest()
+        return self.summary_cache.make_key(article.get("link", ""), content_hash, self.model, PROMPT_VERSION)
+
     def extract_full_text(self, url: str, min_length: int = 200) -> str:
         """
         Extract the full text of an article from the given URL using the Newspaper3k library.
         This method handles retries, SSL errors, and ensures the text is long enough to be useful.
+        Pages are downloaded over a shared pooled session and their parsed text is cached
+        on disk; stale entries are revalidated with ETag/Last-Modified conditional requests.
 
         Args:
             url (str): The URL of the article to fetch and parse.
@@ -80,43 +230,77 @@ class NewsSummarizer:
         Returns:
             str: The extracted article text, or an empty string if there were issues.
         """
-        headers = {'User-Agent': 'Mozilla/5.0'}
-        session = requests.Session()
+        cache_key = self.page_cache.make_key(url)
+        cached_page = self.page_cache.get(cache_key)
 
-        # Set up retries in case of failed connections
-        retries = Retry(total=3, backoff_factor=0.3, status_forcelist=[500, 502, 503, 504])
-        adapter = HTTPAdapter(max_retries=retries)
-        session.mount("https://", adapter)
+        # Serve recently fetched pages without touching the network
+        if cached_page and time.time() - cached_page["fetched_at"] < self.page_refresh_after:
+            return self._check_length(url, cached_page["text"], min_length)
+
+        # Ask the server to only send the page if it changed since it was cached
+        headers = {}
+        if cached_page:
+            if cached_page.get("etag"):
+                headers["If-None-Match"] = cached_page["etag"]
+            if cached_page.get("last_modified"):
+                headers["If-Modified-Since"] = cached_page["last_modified"]
 
         try:
             # Attempt to retrieve the article page
-            response = session.get(url, headers=headers, timeout=10)
-            response.raise_for_status()  # Will raise an error if the status code isn't 200
+            response = self.session.get(url, headers=headers, timeout=10)
+            response.raise_for_status()  # Will raise an error for 4xx and 5xx responses
         except requests.exceptions.SSLError as ssl_err:
             print(f"SSL error for {url}: {ssl_err} - trying without verification")
             # Retry the request without SSL verification (risky, use cautiously)
-            response = session.get(url, headers=headers, timeout=10, verify=False)
+            response = self.session.get(url, headers=headers, timeout=10, verify=False)
         except Exception as e:
             print(f"Failed to download page {url}: {e}")
             return ""  # Return an empty string if the request fails
 
+        # The page is unchanged, so the cached text is still valid
+        if response.status_code == 304 and cached_page:
+            cached_page["fetched_at"] = time.time()
+            self.page_cache.set(cache_key, cached_page)
+            return self._check_length(url, cached_page["text"], min_length)
+
         try:
             # Use Newspaper3k to parse the article's content
             article = Article(url)
             article.set_html(response.text)
             article.parse()
             text = article.text.strip()
-
-            # Ensure the extracted text is long enough
-            if len(text) < min_length:
-                print(f"Extracted text from {url} too short ({len(text)})")
-                return ""  # Return empty string if text is too short
-
-            return text  # Return the parsed article text
         except Exception as e:
             print(f"Failed to parse article from {url}: {e}")
             return ""  # Return empty string if parsing fails
 
+        # Store the parsed text even if it is short, so the page is not downloaded again
+        self.page_cache.set(cache_key, {
+            "text": text,
+            "etag": response.headers.get("ETag"),
+            "last_modified": response.headers.get("Last-Modified"),
+            "fetched_at": time.time(),
+        })
+
+        return self._check_length(url, text, min_length)
+
+    def _check_length(self, url: str, text: str, min_length: int) -> str:
+        """
+        Ensure the extracted text is long enough to be useful.
+
+        Args:
+            url (str): The URL the text was extracted from.
+            text (str): The extracted article text.
+            min_length (int): Minimum length of the extracted text to be considered valid.
+
+        Returns:
+            str: The text, or an empty string if it is too short.
+        """
+        if len(text) < min_length:
+            print(f"Extracted text from {url} too short ({len(text)})")
+            return ""  # Return empty string if text is too short
+
+        return text  # Return the parsed article text
+
     def generate_summary(self, article: Dict) -> str:
         """
         Generate a summary of the article by interacting with the OpenAI API.
@@ -127,16 +311,259 @@ class NewsSummarizer:
         Returns:
             str: The generated summary, or an error message if there was an issue.
         """
+        # Reuse the stored summary if this article was already summarized
+        cache_key = self._summary_cache_key(article)
+        cached_summary = self.summary_cache.get(cache_key)
+        if cached_summary is not None:
+            return cached_summary
+
         try:
             # Call OpenAI's API to generate a summary based on the messages
             response = self.client.chat.completions.create(
-                model="llama3.2",
+                model=self.model,
                 messages=self._create_messages(article),
                 temperature=0.7,  # Adjust the creativity of the response
                 max_tokens=200,  # Limit the number of tokens in the response
             )
-            return response.choices[0].message.content  # Return the generated summary
+            summary = response.choices[0].message.content
+
+            # Only successful summaries are stored, so failures are retried next time
+            self.summary_cache.set(cache_key, summary)
+            return summary  # Return the generated summary
 
         except Exception as e:
             # Handle any errors that may occur during the OpenAI API call
             return f"Error generating summary: {str(e)}"
+
+    def stream_summary(self, article: Dict) -> Iterator[str]:
+        """
+        Generate a summary of the article as a stream, yielding the text as the model
+        produces it so the UI can display it progressively.
+
+        Args:
+            article (Dict): A dictionary representing the article to summarize.
+
+        Yields:
+            str: Successive pieces of the summary, or an error message if there was an issue.
+        """
+        # A stored summary is returned in one piece
+        cache_key = self._summary_cache_key(article)
+        cached_summary = self.summary_cache.get(cache_key)
+        if cached_summary is not None:
+            yield cached_summary
+            return
+
+        parts = []
+        try:
+            stream = self.client.chat.completions.create(
+                model=self.model,
+                messages=self._create_messages(article),
+                temperature=0.7,  # Adjust the creativity of the response
+                max_tokens=200,  # Limit the number of tokens in the response
+                stream=True,
+            )
+            for chunk in stream:
+                if not chunk.choices:
+                    continue
+                text = chunk.choices[0].delta.content or ""
+                if text:
+                    parts.append(text)
+                    yield text
+        except Exception as e:
+            # Handle any errors that may occur during the OpenAI API call
+            yield f"Error generating summary: {str(e)}"
+            return
+
+        # Store the complete summary once the stream has finished
+        if parts:
+            self.summary_cache.set(cache_key, "".join(parts))
+
+    def _stream_into_queue(self, article: Dict, chunks: Queue, cancelled: threading.Event):
+        """
+        Stream an article's summary into a queue, ending it with None.
+
+        Args:
+            article (Dict): A dictionary representing the article to summarize.
+            chunks (Queue): The queue that receives the pieces of the summary.
+            cancelled (threading.Event): Set when nobody will read the summary any more.
+        """
+        try:
+            for text in self.stream_summary(article):
+                if cancelled.is_set():
+                    break
+                chunks.put(text)
+        finally:
+            chunks.put(None)
+
+    def _read_queue(self, chunks: Queue) -> Iterator[str]:
+        """
+        Yield the pieces of a summary from its queue until it ends.
+
+        Args:
+            chunks (Queue): The queue filled by _stream_into_queue.
+
+        Yields:
+            str: Successive pieces of the summary.
+        """
+        while True:
+            text = chunks.get()
+            if text is None:
+                return
+            yield text
+
+    def _fill_full_text(self, article: Dict):
+        """
+        Download the article page and store its text in the article's "full_text".
+
+        Args:
+            article (Dict): A dictionary representing the article.
+        """
+        article["full_text"] = self.extract_full_text(article["link"])
+
+    def stream_articles(
+            self,
+            articles: List[Dict],
+            extract_workers: int = 8,
+            summary_workers: int = 2,
+    ) -> Iterator[Tuple[int, Dict, Iterator[str]]]:
+        """
+        Stream the summaries of several articles concurrently. Worker threads generate the
+        summaries and feed each one into its own queue, so the caller can display the
+        articles in order while the later summaries are already being generated. Pages
+        are downloaded in the background at the same time. If the caller stops early,
+        e.g. on a Streamlit rerun, the remaining work is cancelled.
+
+        Args:
+            articles (List[Dict]): The articles to process.
+            extract_workers (int): Maximum number of pages downloaded at the same time.
+            summary_workers (int): Maximum number of summaries generated at the same time.
+
+        Yields:
+            Tuple[int, Dict, Iterator[str]]: The article's index in the input list, the
+            article and a stream of its summary text, in input order.
+        """
+        chunk_queues = [Queue() for _ in articles]
+        cancelled = threading.Event()
+        extract_pool = ThreadPoolExecutor(max_workers=extract_workers)
+        summary_pool = ThreadPoolExecutor(max_workers=summary_workers)
+        closed_early = False
+        try:
+            for article, chunks in zip(articles, chunk_queues):
+                extract_pool.submit(self._fill_full_text, article)
+                summary_pool.submit(self._stream_into_queue, article, chunks, cancelled)
+
+            for index, (article, chunks) in enumerate(zip(articles, chunk_queues)):
+                yield index, article, self._read_queue(chunks)
+        except GeneratorExit:
+            closed_early = True
+            cancelled.set()
+            raise
+        finally:
+            for pool in (extract_pool, summary_pool):
+                pool.shutdown(wait=not closed_early, cancel_futures=closed_early)
+
+    def generate_summaries(self, articles: List[Dict], batch_size: int = 5) -> List[str]:
+        """
+        Generate summaries for several articles, packing up to batch_size articles into
+        each request so the system prompt is only processed once per batch. Articles the
+        model leaves out or returns malformed are summarized individually instead.
+
+        Args:
+            articles (List[Dict]): The articles to summarize.
+            batch_size (int): Maximum number of articles sent in a single request.
+
+        Returns:
+            List[str]: The summaries, in the same order as the articles.
+        """
+        summaries = [None] * len(articles)
+
+        # Reuse stored summaries and only send the remaining articles to the model
+        pending = []
+        for index, article in enumerate(articles):
+            cached_summary = self.summary_cache.get(self._summary_cache_key(article))
+            if cached_summary is not None:
+                summaries[index] = cached_summary
+            else:
+                pending.append(index)
+
+        for start in range(0, len(pending), batch_size):
+            batch = pending[start:start + batch_size]
+            batch_articles = [articles[index] for index in batch]
+
+            try:
+                response = self.client.chat.completions.create(
+                    model=self.model,
+                    messages=self._create_batch_messages(batch_articles),
+                    temperature=0.7,  # Adjust the creativity of the response
+                    max_tokens=200 * len(batch),  # Same budget per article as a single summary
+                    response_format={"type": "json_object"},
+                )
+                parsed = self._parse_batch_response(response.choices[0].message.content, len(batch))
+            except Exception as e:
+                print(f"Batch summary failed, falling back to single summaries: {e}")
+                parsed = {}
+
+            for number, index in enumerate(batch, start=1):
+                if number in parsed:
+                    summaries[index] = parsed[number]
+                    self.summary_cache.set(self._summary_cache_key(articles[index]), parsed[number])
+                else:
+                    summaries[index] = self.generate_summary(articles[index])
+
+        return summaries
+
+    def process_articles(
+            self,
+            articles: List[Dict],
+            extract_workers: int = 8,
+            summary_workers: int = 2,
+    ) -> Iterator[Tuple[int, Dict, str]]:
+        """
+        Extract and summarize articles concurrently. A bounded pool downloads and parses
+        the articles while a second pool generates the summaries from the article
+        descriptions at the same time, so the total time is close to the slowest article
+        instead of the sum. If the caller stops early, e.g. on a Streamlit rerun, work
+        that has not started yet is cancelled instead of waited for.
+
+        Args:
+            articles (List[Dict]): The articles to process.
+            extract_workers (int): Maximum number of pages downloaded at the same time.
+            summary_workers (int): Maximum number of summaries generated at the same time.
+
+        Yields:
+            Tuple[int, Dict, str]: The article's index in the input list, the article
+            (with its "full_text" filled in) and its summary, in order of completion.
+        """
+        extract_pool = ThreadPoolExecutor(max_workers=extract_workers)
+        summary_pool = ThreadPoolExecutor(max_workers=summary_workers)
+        closed_early = False
+        try:
+            # Map each running future to its task and article index. Summaries only read
+            # the article description, so they don't wait for the page download
+            pending = {}
+            for index, article in enumerate(articles):
+                pending[extract_pool.submit(self.extract_full_text, article["link"])] = ("extract", index)
+                pending[summary_pool.submit(self.generate_summary, article)] = ("summary", index)
+
+            # Tasks still running for each article, and summaries waiting for their download
+            remaining = [2] * len(articles)
+            summaries = {}
+
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    task, index = pending.pop(future)
+                    if task == "extract":
+                        articles[index]["full_text"] = future.result()
+                    else:
+                        summaries[index] = future.result()
+
+                    remaining[index] -= 1
+                    if remaining[index] == 0:
+                        yield index, articles[index], summaries.pop(index)
+        except GeneratorExit:
+            closed_early = True
+            raise
+        finally:
+            for pool in (extract_pool, summary_pool):
+                pool.shutdown(wait=not closed_early, cancel_futures=closed_early)
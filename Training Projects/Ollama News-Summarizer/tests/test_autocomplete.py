@@ -0,0 +1,92 @@
+import os
+import sys
+import threading
+import pytest
+
+# The app's modules are imported from the source directory, as when running source/app.py
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "source"))
+
+import autocomplete_stub
+from autocomplete import AutocompleteService
+
+@pytest.fixture(scope="module")
+def stub_url():
+    # Local stand-in for LocationIQ on a free port
+    server = autocomplete_stub.run(0)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_port}/v1"
+    server.shutdown()
+    server.server_close()
+
+@pytest.fixture(autouse=True)
+def cache_dir(tmp_path, monkeypatch):
+    # The disk cache lives under config/ in the working directory
+    monkeypatch.chdir(tmp_path)
+
+def make_service(stub_url, path="autocomplete.php", **kwargs):
+    """Create a service pointed at the stub, counting the requests it sends"""
+    service = AutocompleteService("test-key", base_url=f"{stub_url}/{path}", **kwargs)
+    service.requests_sent = 0
+    send = service.session.get
+
+    def counting_get(*args, **get_kwargs):
+        service.requests_sent += 1
+        return send(*args, **get_kwargs)
+
+    service.session.get = counting_get
+    return service
+
+def test_short_queries_are_not_sent(stub_url):
+    service = make_service(stub_url)
+    assert service.suggest("ed") == []
+    assert service.requests_sent == 0
+
+def test_longer_queries_reuse_a_complete_prefix_result(stub_url):
+    service = make_service(stub_url)
+    results = service.suggest("edm")
+    assert [item["address"]["city"] for item in results] == ["Edmonton"]
+
+    for end in range(4, len("edmonton alberta") + 1):
+        assert service.suggest("edmonton alberta"[:end]) == results
+    assert service.requests_sent == 1
+
+def test_prefix_reuse_filters_out_non_matches(stub_url):
+    service = make_service(stub_url)
+    # "van" and "vic" share no complete prefix result, but "vancouver" filters the "van" result
+    assert len(service.suggest("van")) == 1
+    assert service.suggest("vancouverx") == []
+    assert service.requests_sent == 1
+
+def test_full_prefix_result_is_not_reused(stub_url):
+    service = make_service(stub_url, limit=1)
+    service.suggest("alb")
+    service.suggest("albe")
+    # With limit=1 the result for "alb" may be incomplete, so "albe" is fetched
+    assert service.requests_sent == 2
+
+def test_no_match_404_is_cached(stub_url):
+    service = make_service(stub_url)
+    assert service.suggest("zzzz") == []
+    assert service.suggest("zzzz") == []
+    assert service.requests_sent == 1
+
+def test_disk_cache_is_shared_by_new_instances(stub_url):
+    make_service(stub_url).suggest("calgary")
+    service = make_service(stub_url)
+    assert [item["address"]["city"] for item in service.suggest("calgary")] == ["Calgary"]
+    assert service.requests_sent == 0
+
+def test_expired_disk_entries_are_fetched_again(stub_url):
+    make_service(stub_url, cache_ttl=0).suggest("regina")
+    service = make_service(stub_url, cache_ttl=0)
+    assert len(service.suggest("regina")) == 1
+    assert service.requests_sent == 1
+
+def test_non_json_response_returns_no_suggestions(stub_url):
+    service = make_service(stub_url, path="broken.php")
+    assert service.suggest("edmonton") == []
+
+def test_network_error_returns_no_suggestions():
+    service = AutocompleteService("test-key", base_url="http://127.0.0.1:9/v1/autocomplete.php", timeout=1)
+    assert service.suggest("edmonton") == []
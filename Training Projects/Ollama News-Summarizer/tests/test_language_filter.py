@@ -0,0 +1,48 @@
+import os
+import sys
+import pytest
+
+# The app's modules are imported from the source directory, as when running source/app.py
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "source"))
+
+from language_filter import LanguageFilter
+
+ENGLISH_HEADLINES = [
+    "No charges laid in fatal Edmonton crash",
+    "Two die in highway collision near Calgary",
+    "Do you need a flu shot?",
+    "No injuries in house fire",
+    "City council approves new budget for transit expansion",
+    "Oilers beat Flames 4-2 in Battle of Alberta",
+    "LA wildfires force thousands to evacuate",
+    "Van crashes into storefront on Whyte Avenue",
+    "Prices rise 3 per cent as inflation picks up",
+]
+
+FOREIGN_HEADLINES = [
+    "Le gouvernement annonce une nouvelle réforme des retraites",
+    "La ciudad aprueba el presupuesto para el transporte público",
+    "Die Regierung plant neue Steuern für das nächste Jahr",
+    "Il governo approva la legge di bilancio per il prossimo anno",
+    "O governo anuncia novas medidas para a economia",
+    "Het kabinet wil meer geld voor de zorg",
+    "Правительство объявило о новых мерах",
+]
+
+@pytest.fixture
+def language_filter():
+    # Detection results are cached per process; start each test without them
+    LanguageFilter.cache.clear()
+    return LanguageFilter()
+
+@pytest.mark.parametrize("headline", ENGLISH_HEADLINES)
+def test_english_headlines_are_kept(language_filter, headline):
+    assert language_filter.is_english(headline)
+
+@pytest.mark.parametrize("headline", FOREIGN_HEADLINES)
+def test_foreign_headlines_are_dropped(language_filter, headline):
+    assert not language_filter.is_english(headline)
+
+def test_trusted_sources_skip_detection(language_filter):
+    trusted = LanguageFilter(trusted_sources=["CBC News"])
+    assert trusted.is_english(FOREIGN_HEADLINES[0], source="cbc news")
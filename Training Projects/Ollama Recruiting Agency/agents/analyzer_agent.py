@@ -1,6 +1,34 @@
 from typing import Dict, Any
-from .base_agent import BaseAgent
+from .base_agent import BaseAgent, OLLAMA_MODEL
+from .messages import AnalysisResult, WorkflowContext
 from datetime import datetime
+from db.result_cache import ResultCache
+
+#Analysis prompt template; part of the cache version, so editing it invalidates cached analyses
+ANALYSIS_PROMPT = """
+            Analyze this resume data and return a JSON object with the following structures:
+            - "years_of_experience": number of years of professional work experience (exclude schooling).
+            - "experience_level": one of "Junior", "Mid-level", or "Senior" based strictly on years of professional experience:
+                - Junior: 0-2 years
+                - Mid-level: 3-5 years
+                - Senior: 6+ years
+            {{
+                "technical_skills":["skill1", "skill2"],
+                "years_of_experience": number,
+                "education": {{
+                    "level": "Diploma/Bachelors/Masters/PhD",
+                    "field": "field of study"
+                }},
+                "experience_level": "Junior/Mid-level/Senior",
+                "key_achievements": ["achievement1", "achievement2"],
+                "domain_expertise": ["domain1", "domain2"]
+            }}
+
+            Resume data:
+            {structured_data}
+
+            Return ONLY the JSON object, no other text.
+            """
 
 class AnalyzerAgent(BaseAgent):
     #Initialize the base class with specific parameters for this agent.
@@ -19,48 +47,41 @@ class AnalyzerAgent(BaseAgent):
             Format the output as structured data.
             """
         )
+        #Analyses are cached by the extracted data they were made from, and by model and prompt
+        self.cache = ResultCache()
+        self.cache_version = ResultCache.version(OLLAMA_MODEL, self.instructions, ANALYSIS_PROMPT)
 
-    async def run(self, messages: list) -> Dict[str,Any]:
+    async def run(self, messages: list) -> AnalysisResult:
         """Analyze the exttracted resume data"""
         print("Analyzer: Analyzing candidate profile")
 
-        #Extracting content from last message in input
-        extracted_data = eval(messages[-1]["content"])
+        #The last message carries the workflow context holding the extraction results
+        context: WorkflowContext = messages[-1]["content"]
+        extracted_data = context.extracted_data
 
-        #Construct analysis prompt to send to Ollama API
-        analysis_prompt = f"""
-            Analyze this resume data and return a JSON object with the following structures:
-            - "years_of_experience": number of years of professional work experience (exclude schooling).
-            - "experience_level": one of "Junior", "Mid-level", or "Senior" based strictly on years of professional experience:
-                - Junior: 0-2 years
-                - Mid-level: 3-5 years
-                - Senior: 6+ years
-            {{
-                "technical_skills":["skill1", "skill2"],
-                "years_of_experience": number,
-                "education": {{
-                    "level": "Diploma/Bachelors/Masters/PhD",
-                    "field": "field of study"
-                }},
-                "experience_level": "Junior/Mid-level/Senior",
-                "key_achievements": ["achievement1", "achievement2"],
-                "domain_expertise": ["domain1", "domain2"]
-            }}
+        content_hash = ResultCache.content_hash(extracted_data.structured_data)
+        parsed_result = self.cache.get(content_hash, "analysis", self.cache_version)
+        parsed_ok = parsed_result is not None
 
-            Resume data:
-            {extracted_data["structured_data"]}
+        if parsed_ok:
+            print("Analyzer: Using cached analysis")
+        else:
+            #Construct analysis prompt to send to Ollama API
+            analysis_prompt = ANALYSIS_PROMPT.format(structured_data=extracted_data.structured_data)
 
-            Return ONLY the JSON object, no other text.
-            """
+            #Query Ollama API with analysis prompt
+            analysis_result = await self._aquery_ollama(analysis_prompt)
 
-        #Query Ollama API with analysis prompt
-        analysis_result = self._query_ollama(analysis_prompt)
+            #Parse returned result safely to handle errors in JSON format
+            parsed_result = self._parse_json_safely(analysis_result)
+            parsed_ok = "error" not in parsed_result
 
-        #Parse returned result safely to handle errors in JSON format
-        parsed_result = self._parse_json_safely(analysis_result)
+            #Only successful analyses are cached, so a bad answer gets retried next time
+            if parsed_ok:
+                self.cache.set(content_hash, "analysis", self.cache_version, parsed_result)
 
         #Ensure we have valid data even if parsing fails, set default values for error handling.
-        if "error" in parsed_result:
+        if not parsed_ok:
             parsed_result = {
                 "technical_skills": [],
                 "years_of_experience":0,
@@ -70,9 +91,9 @@ class AnalyzerAgent(BaseAgent):
                 "domain_expertise":[],
             }
         # Return the structured analysis result along with timestamp, and confidence score
-        return{
-            "skills_analysis": parsed_result,
-            "analysis_timestamp": datetime.now().isoformat(),
+        return AnalysisResult(
+            skills_analysis=parsed_result,
+            analysis_timestamp=datetime.now().isoformat(),
             #Higher confidence if there is no error in parsing, other wise lower it.
-            "confidence_score": 0.85 if "error" not in parsed_result else 0.5,
-        }
\ No newline at end of file
+            confidence_score=0.85 if parsed_ok else 0.5,
+        )
\ No newline at end of file
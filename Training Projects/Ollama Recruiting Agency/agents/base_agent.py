@@ -1,32 +1,115 @@
-from typing import Dict, Any
+from typing import Dict, Any, List
+import asyncio
 import json
-from openai import OpenAI
+import os
+import re
+import threading
+import weakref
+import httpx
+from openai import OpenAI, AsyncOpenAI
+from .context_builder import estimate_tokens
+
+OLLAMA_BASE_URL = "http://localhost:11434/v1"
+OLLAMA_MODEL = "llama3.2"
+#Maximum number of requests sent to Ollama at the same time by all agents on one event loop
+MAX_CONCURRENT_REQUESTS = int(os.getenv("OLLAMA_MAX_CONCURRENCY", "4"))
 
 class BaseAgent:
+    #Async client and concurrency limit per event loop, shared by every agent running on that loop;
+    #each Streamlit session runs asyncio.run() on its own thread, so several loops can be live at once
+    _async_clients = weakref.WeakKeyDictionary()
+    _async_clients_lock = threading.Lock()
+
     def __init__(self,name:str,instructions:str):
         self.name = name
         self.instructions = instructions
         self.ollama_client = OpenAI(
-            base_url = "http://localhost:11434/v1",
+            base_url = OLLAMA_BASE_URL,
             api_key = "ollama",     #reqyured but unused
         )
 
     async def run(self,messages:list)->Dict[str, Any]:
         """Default run method to be overridden by child classes"""
         raise NotImplementedError("Subclasses must implement run()")
-    
+
+    def _build_messages(self,prompt:str)->List[Dict[str,str]]:
+        """Build the chat messages sent to the model"""
+        return [
+            {"role":"system","content":self.instructions},
+            {"role": "user", "content":prompt},
+        ]
+
+    def _log_prompt_tokens(self,prompt:str,response)->None:
+        """Print the prompt size, to keep an eye on prefill cost"""
+        estimated = estimate_tokens(self.instructions) + estimate_tokens(prompt)
+        usage = getattr(response, "usage", None)
+        if usage is not None and usage.prompt_tokens:
+            print(f"{self.name}: prompt {usage.prompt_tokens} tokens (estimated {estimated}), completion {usage.completion_tokens} tokens")
+        else:
+            print(f"{self.name}: prompt ~{estimated} tokens (estimated)")
+
     def _query_ollama(self,prompt:str)->str:
-        """Query Ollama model with the given prompt"""
+        """Query Ollama model with the given prompt (blocking)"""
         try:
             response = self.ollama_client.chat.completions.create(
-                model = "llama3.2",
-                messages =[
-                    {"role":"system","content":self.instructions},
-                    {"role": "user", "content":prompt},
-                ],
+                model = OLLAMA_MODEL,
+                messages = self._build_messages(prompt),
                 temperature=0.1,
                 max_tokens=2000,
             )
+            self._log_prompt_tokens(prompt, response)
+            return response.choices[0].message.content
+        except Exception as e:
+            print(f"Error querying Ollama: {str(e)}")
+            raise
+
+    @classmethod
+    def _get_async_client(cls):
+        """Return the async client and semaphore of the running event loop, creating them if needed"""
+        loop = asyncio.get_running_loop()
+        #httpx connections can't be reused across loops;
+        #callers close the client with close_async_client() before their loop ends
+        with BaseAgent._async_clients_lock:
+            entry = BaseAgent._async_clients.get(loop)
+            if entry is None:
+                http_client = httpx.AsyncClient(
+                    limits=httpx.Limits(
+                        max_connections=MAX_CONCURRENT_REQUESTS,
+                        max_keepalive_connections=MAX_CONCURRENT_REQUESTS,
+                    ),
+                    timeout=httpx.Timeout(300.0, connect=10.0),
+                )
+                client = AsyncOpenAI(
+                    base_url = OLLAMA_BASE_URL,
+                    api_key = "ollama",     #required but unused
+                    http_client = http_client,
+                )
+                entry = (client, asyncio.Semaphore(MAX_CONCURRENT_REQUESTS))
+                BaseAgent._async_clients[loop] = entry
+        return entry
+
+    @classmethod
+    async def close_async_client(cls):
+        """Close the running event loop's async client; call it before that loop ends"""
+        loop = asyncio.get_running_loop()
+        with BaseAgent._async_clients_lock:
+            entry = BaseAgent._async_clients.pop(loop, None)
+        if entry is not None:
+            await entry[0].close()
+
+    async def _aquery_ollama(self,prompt:str)->str:
+        """Query Ollama model with the given prompt without blocking the event loop"""
+        client, semaphore = self._get_async_client()
+        try:
+            #Wait for a free slot so concurrent pipelines don't flood Ollama
+            async with semaphore:
+                response = await client.chat.completions.create(
+                    model = OLLAMA_MODEL,
+                    messages = self._build_messages(prompt),
+                    temperature=0.1,
+                    max_tokens=2000,
+                )
+            self._log_prompt_tokens(prompt, response)
             return response.choices[0].message.content
         except Exception as e:
             print(f"Error querying Ollama: {str(e)}")
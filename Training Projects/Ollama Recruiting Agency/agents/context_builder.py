@@ -0,0 +1,131 @@
+from typing import Dict, Any, List
+import copy
+import json
+import math
+import re
+
+#Rough characters-per-token ratio of llama tokenizers on English text
+CHARS_PER_TOKEN = 4
+TRUNCATION_MARKER = " …[truncated]"
+#Shortest useful length of a shortened string, marker included
+MIN_STRING_CHARS = 40
+
+def estimate_tokens(text: str) -> int:
+    """Estimate the number of tokens in a text without running a tokenizer"""
+    return math.ceil(len(text) / CHARS_PER_TOKEN)
+
+def shorten_text(text: str, max_chars: int) -> str:
+    """Shorten a text to at most max_chars, cutting at a line or sentence boundary when possible"""
+    if len(text) <= max_chars:
+        return text
+    limit = max(max_chars - len(TRUNCATION_MARKER), 0)
+    head = text[:limit]
+    #Prefer ending on a full line or sentence if that keeps most of the text
+    boundary = max(head.rfind("\n"), max((m.end() for m in re.finditer(r"[.!?]\s", head)), default=-1))
+    if boundary > limit * 0.6:
+        head = head[:boundary]
+    return head.rstrip() + TRUNCATION_MARKER
+
+class ContextBuilder:
+    """Build the compact JSON context of a prompt from selected workflow fields, within a token budget"""
+    def __init__(self, fields: List[str], max_tokens: int):
+        #Fields are listed most important first; the last ones are dropped first when space runs out
+        self.fields = fields
+        self.max_tokens = max_tokens
+
+    def build(self, workflow_context: Any) -> str:
+        """Return compact JSON of the selected fields, shortening the longest text fields to fit the budget"""
+        payload = {}
+        for name in self.fields:
+            value = getattr(workflow_context, name)
+            if value is not None:
+                payload[name] = value.to_llm()
+
+        max_chars = self.max_tokens * CHARS_PER_TOKEN
+
+        #Every string keeps its truncation marker and the JSON structure never shrinks, so with many
+        #strings shortening alone can't meet the budget, or leaves nothing readable; drop whole
+        #items, least important first, until every string can keep at least MIN_STRING_CHARS
+        if not self._fits(payload, MIN_STRING_CHARS, max_chars):
+            payload = copy.deepcopy(payload)
+            while not self._fits(payload, MIN_STRING_CHARS, max_chars) and self._drop_last_item(payload):
+                pass
+
+        text = self._shorten(payload, max_chars)
+        #Escaping may still leave it a little over; the workflow's own objects are never modified
+        if len(text) > max_chars:
+            payload = copy.deepcopy(payload)
+            while len(text) > max_chars and self._drop_last_item(payload):
+                text = self._shorten(payload, max_chars)
+        return text
+
+    def _fits(self, payload: Dict[str, Any], cap: int, max_chars: int) -> bool:
+        """Whether the payload fits in max_chars with every string shortened to at most cap characters"""
+        return len(self._encode(self._cap_strings(payload, cap))) <= max_chars
+
+    def _shorten(self, payload: Dict[str, Any], max_chars: int) -> str:
+        """Encode the payload, shortening the longest strings so it fits in max_chars if possible"""
+        text = self._encode(payload)
+        #Escaping can make the JSON a little longer than planned, so retry with a tighter allowance
+        for _ in range(3):
+            if len(text) <= max_chars:
+                break
+            overflow = len(text) - max_chars
+            strings = self._collect_strings(payload)
+            cap = self._fair_cap([len(s) for s in strings], sum(len(s) for s in strings) - overflow)
+            payload = self._cap_strings(payload, cap)
+            text = self._encode(payload)
+        return text
+
+    def _drop_last_item(self, payload: Dict[str, Any]) -> bool:
+        """Remove the last list item of the least important field, or the whole field if it has none"""
+        if not payload:
+            return False
+        name = next(reversed(payload))
+        if not self._pop_last_list_item(payload[name]):
+            del payload[name]
+        return True
+
+    def _pop_last_list_item(self, value: Any) -> bool:
+        """Remove the last item of the last non-empty list in a nested value"""
+        if isinstance(value, list) and value:
+            value.pop()
+            return True
+        if isinstance(value, dict):
+            return any(self._pop_last_list_item(item) for item in reversed(list(value.values())))
+        return False
+
+    def _encode(self, payload: Dict[str, Any]) -> str:
+        return json.dumps(payload, separators=(",", ":"), ensure_ascii=False, default=str)
+
+    def _collect_strings(self, value: Any) -> List[str]:
+        """Collect every string leaf of a nested value"""
+        if isinstance(value, str):
+            return [value]
+        if isinstance(value, dict):
+            return [s for item in value.values() for s in self._collect_strings(item)]
+        if isinstance(value, (list, tuple)):
+            return [s for item in value for s in self._collect_strings(item)]
+        return []
+
+    def _fair_cap(self, lengths: List[int], allowance: int) -> int:
+        """Largest per-string length cap so the capped lengths add up to at most the allowance"""
+        allowance = max(allowance, 0)
+        remaining = len(lengths)
+        #Short strings are kept whole; the allowance left over is shared by the longer ones
+        for length in sorted(lengths):
+            if length * remaining > allowance:
+                return allowance // remaining
+            allowance -= length
+            remaining -= 1
+        return max(lengths, default=0)
+
+    def _cap_strings(self, value: Any, cap: int) -> Any:
+        """Copy of a nested value with every string shortened to at most cap characters"""
+        if isinstance(value, str):
+            return shorten_text(value, cap)
+        if isinstance(value, dict):
+            return {key: self._cap_strings(item, cap) for key, item in value.items()}
+        if isinstance(value, (list, tuple)):
+            return [self._cap_strings(item, cap) for item in value]
+        return value
@@ -1,6 +1,11 @@
 from typing import Dict,Any
-from pdfminer.high_level import extract_text
-from .base_agent import BaseAgent
+import asyncio
+import os
+from pathlib import Path
+from db.result_cache import ResultCache
+from utils.pdf_extraction import PdfExtractor
+from .base_agent import BaseAgent, OLLAMA_MODEL
+from .messages import ExtractionResult, WorkflowContext
 
 class ExtractorAgent(BaseAgent):
     # Initialize the base class with specific parameters for this agent.
@@ -13,27 +18,51 @@ class ExtractorAgent(BaseAgent):
                 Provide output in a clear, structured format.
             """
         )
+        #PDF text extraction backend: pymupdf when installed, otherwise page-parallel pdfminer
+        self.pdf_extractor = PdfExtractor(backend=os.getenv("PDF_BACKEND", "auto"))
+        #Results are cached by resume content, and by model and prompt for the LLM step;
+        #for PDFs the LLM step is keyed by the PDF bytes, so the extraction backend and limits count too
+        self.cache = ResultCache()
+        self.cache_version = ResultCache.version(OLLAMA_MODEL, self.instructions)
+        self.pdf_cache_version = ResultCache.version(OLLAMA_MODEL, self.instructions, self.pdf_extractor.version)
     
-    async def run(self, messages:list)->Dict[str,Any]:
+    async def run(self, messages:list)->ExtractionResult:
         """Process the resume and extract information"""
         print("Extractor: Processing resume")
 
-        # Extract content from last message; expected to be a dictionary with PDF file path or raw text
-        resume_data = eval(messages[-1]["content"])
+        # The last message carries the workflow context, whose resume has a PDF file path or raw text
+        context: WorkflowContext = messages[-1]["content"]
+        resume = context.resume
 
         #Determine whether we're dealing witha PDF file or plain text.
-        if resume_data.get("file_path"):
-            #If the key "file_path" exists, extract raw text from the specified PDF using pdfminer's high-level function.
-            raw_text = extract_text(resume_data["file_path"])
+        if resume.file_path:
+            #Hash the PDF bytes so a re-uploaded resume is recognized whatever its file name
+            pdf_bytes = await asyncio.to_thread(Path(resume.file_path).read_bytes)
+            content_hash = ResultCache.content_hash(pdf_bytes)
+
+            raw_text = self.cache.get(content_hash, "raw_text", self.pdf_extractor.version)
+            if raw_text is None:
+                #If the key "file_path" exists, extract raw text from the specified PDF.
+                #Extraction runs in worker processes, within size, page and time limits
+                raw_text = await self.pdf_extractor.extract(pdf_bytes)
+                self.cache.set(content_hash, "raw_text", self.pdf_extractor.version, raw_text)
+            cache_version = self.pdf_cache_version
         else:
             #If no file path is provided, use any available text in the message directly (default to empty string if not present).
-            raw_text = resume_data.get("text", "")
+            raw_text = resume.text
+            content_hash = ResultCache.content_hash(raw_text)
+            cache_version = self.cache_version
 
-        #Query Ollama API with the extrated or inputted text to obtain structured information
-        extracted_info = self._query_ollama(raw_text)
+        extracted_info = self.cache.get(content_hash, "extraction", cache_version)
+        if extracted_info is None:
+            #Query Ollama API with the extrated or inputted text to obtain structured information
+            extracted_info = await self._aquery_ollama(raw_text)
+            self.cache.set(content_hash, "extraction", cache_version, extracted_info)
+        else:
+            print("Extractor: Using cached extraction")
 
-        return{
-            "raw_text":raw_text,    #Raw extracted or inputted text
-            "structured_data":extracted_info,   #Structured data obtained from querying the external service (Ollama)
-            "extraction_status": "completed"    #Status indicating that extraction process has completed.
-        }
\ No newline at end of file
+        return ExtractionResult(
+            raw_text=raw_text,    #Raw extracted or inputted text
+            structured_data=extracted_info,   #Structured data obtained from querying the external service (Ollama)
+            extraction_status="completed",    #Status indicating that extraction process has completed.
+        )
\ No newline at end of file
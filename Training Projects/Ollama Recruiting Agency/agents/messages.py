@@ -0,0 +1,90 @@
+from typing import Dict, Any, List, Optional
+from dataclasses import dataclass, field, asdict
+from datetime import datetime
+
+#Typed messages passed by reference between agents, instead of str()/eval() round trips
+
+@dataclass(slots=True)
+class ResumeInput:
+    """A resume submitted to the pipeline, as a PDF path or plain text"""
+    file_path: Optional[str] = None
+    text: str = ""
+    submission_timestamp: Optional[str] = None
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "ResumeInput":
+        """Build from the resume dict used by app.py and the batch API, ignoring unknown keys"""
+        return cls(
+            file_path=data.get("file_path"),
+            text=data.get("text", ""),
+            submission_timestamp=data.get("submission_timestamp"),
+        )
+
+@dataclass(slots=True)
+class ExtractionResult:
+    raw_text: str
+    structured_data: str
+    extraction_status: str = "completed"
+
+    def to_llm(self) -> Dict[str, Any]:
+        """Fields sent to the model; the raw text is already summarized in structured_data"""
+        return {"structured_data": self.structured_data}
+
+@dataclass(slots=True)
+class AnalysisResult:
+    skills_analysis: Dict[str, Any]
+    analysis_timestamp: str
+    confidence_score: float
+
+    def to_llm(self) -> Dict[str, Any]:
+        return {"skills_analysis": self.skills_analysis, "confidence_score": self.confidence_score}
+
+@dataclass(slots=True)
+class MatchResult:
+    matched_jobs: List[Dict[str, Any]]
+    match_timestamp: datetime
+    number_of_matches: int
+
+    def to_llm(self) -> Dict[str, Any]:
+        return {"matched_jobs": self.matched_jobs, "number_of_matches": self.number_of_matches}
+
+@dataclass(slots=True)
+class ScreeningResult:
+    screening_report: str
+    screening_timestamp: datetime
+    screening_score: int
+    #Best job match score, filled in once matching has finished
+    skill_match_percentage: Optional[int] = None
+
+    def to_llm(self) -> Dict[str, Any]:
+        return {
+            "screening_report": self.screening_report,
+            "screening_score": self.screening_score,
+            "skill_match_percentage": self.skill_match_percentage,
+        }
+
+@dataclass(slots=True)
+class RecommendationResult:
+    final_recommendation: str
+    recommendation_timestamp: datetime
+    confidence_level: str
+
+@dataclass(slots=True)
+class WorkflowContext:
+    """State of one application moving through the pipeline, shared by reference by every stage"""
+    resume: ResumeInput
+    status: str = "initiated"
+    current_stage: str = "extraction"
+    extracted_data: Optional[ExtractionResult] = None
+    analysis_results: Optional[AnalysisResult] = None
+    job_matches: Optional[MatchResult] = None
+    screening_results: Optional[ScreeningResult] = None
+    final_recommendation: Optional[RecommendationResult] = None
+    stage_timings: Dict[str, Dict[str, float]] = field(default_factory=dict)
+    error: Optional[str] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Plain dict in the shape returned by process_application, for the UI and JSON output"""
+        result = asdict(self)
+        result["resume_data"] = result.pop("resume")
+        return result
@@ -1,10 +1,28 @@
-from typing import Dict, Any
+from typing import Dict, Any, Callable, List, Optional
+import asyncio
+import json
+import os
+import time
+from datetime import datetime
 from .base_agent import BaseAgent
 from .extractor_agent import ExtractorAgent
 from .analyzer_agent import AnalyzerAgent
 from .matcher_agent import MatcherAgent
 from .screener_agent import ScreenerAgent
 from .recommender_agent import RecommenderAgent
+from .stage_scheduler import Stage, StageScheduler
+from .messages import (
+    AnalysisResult,
+    ExtractionResult,
+    MatchResult,
+    RecommendationResult,
+    ResumeInput,
+    ScreeningResult,
+    WorkflowContext,
+)
+
+#Pipeline stages, each listed after the stages it depends on
+STAGES = ["extraction", "analysis", "matching", "screening", "match screening", "recommendation"]
 
 class OrchestratorAgent(BaseAgent):
     def __init__(self):
@@ -19,75 +37,138 @@ class OrchestratorAgent(BaseAgent):
         self._setup_agents()
 
     def _setup_agents(self):
-        """Initialize all specialized agents"""
+        """Initialize all specialized agents and the stage graph connecting them"""
         self.extractor = ExtractorAgent()
         self.analyzer = AnalyzerAgent()
-        self.matcher = MatcherAgent()
+        self.matcher = MatcherAgent(mode=os.getenv("MATCH_MODE", "exact"))
         self.screener = ScreenerAgent()
         self.recommender = RecommenderAgent()
 
+        #Matching and the profile part of screening both only need the analysis, so they run at the
+        #same time; the match-dependent screening criteria are added once both have finished
+        self.scheduler = StageScheduler(
+            [
+                Stage("extraction", self._extract, "extracted_data"),
+                Stage("analysis", self._analyze, "analysis_results", ["extraction"]),
+                Stage("matching", self._match, "job_matches", ["analysis"]),
+                Stage("screening", self._screen, "screening_results", ["analysis"]),
+                Stage("match screening", self._screen_matches, "screening_results", ["matching", "screening"]),
+                Stage(
+                    "recommendation",
+                    self._recommend,
+                    "final_recommendation",
+                    ["extraction", "analysis", "matching", "match screening"],
+                ),
+            ]
+        )
+
     async def run(self, messages: list)-> Dict[str, Any]:
         """Process a single message through the agent"""
         prompt = messages[-1]["content"]
-        response = self._query_ollama(prompt)
+        response = await self._aquery_ollama(prompt)
         return self._parse_json_safely(response)
     
-    async def process_application(self,resume_data:Dict[str,Any]) -> Dict[str,Any]:
+    async def process_application(
+        self,
+        resume_data:Dict[str,Any],
+        progress_callback: Optional[Callable[[str], None]] = None,
+    ) -> Dict[str,Any]:
         """Main workflow orchestrator for processing job applications"""
         print("Orchestrator: Starting application process")
 
-        workflow_context = {
-            "resume_data": resume_data,
-            "status": "initiated",
-            "current_stage": "extraction",
-        }
+        #Every stage reads from and writes to this one context object; nothing is copied between agents
+        workflow_context = WorkflowContext(resume=ResumeInput.from_dict(resume_data))
         
         try:
-            #Extract resume information
-            extracted_data = await self.extractor.run(
-                [{"role": "user", "content": str(resume_data)}]
-            )
-            workflow_context.update(
-                {"extracted_data": extracted_data, "current_stage":"analysis"}
-            )
-
-            #Analyze canadidate profile
-            analysis_results = await self.analyzer.run(
-                [{"role":"user", "content": str(extracted_data)}]
-            )
-            workflow_context.update(
-                {"analysis_results": analysis_results, "current_stage": "matching"}
-            )
-
-            #Match with jobs
-            job_matches = await self.matcher.run(
-                [{"role":"user", "content": str(analysis_results)}]
-            )
-            workflow_context.update(
-                {"job_matches": job_matches, "current_stage": "screening"}
-            )
-
-            #Screen candidate
-            screening_results = await self.screener.run(
-                [{"role": "user", "content": str(workflow_context)}]
-            )
-            workflow_context.update(
-                {
-                    "screening_results": screening_results,
-                    "current_stage": "recommendation",
+            #Independent stages run concurrently, so the latency is that of the critical path
+            workflow_context.stage_timings = await self.scheduler.run(workflow_context, progress_callback)
+            workflow_context.status = "completed"
+            return workflow_context.to_dict()
+
+        except Exception as e:
+            workflow_context.status = "failed"
+            workflow_context.error = str(e)
+            raise
+
+    async def _extract(self, workflow_context: WorkflowContext) -> ExtractionResult:
+        """Extract resume information"""
+        return await self.extractor.run([{"role": "user", "content": workflow_context}])
+
+    async def _analyze(self, workflow_context: WorkflowContext) -> AnalysisResult:
+        """Analyze canadidate profile"""
+        return await self.analyzer.run([{"role":"user", "content": workflow_context}])
+
+    async def _match(self, workflow_context: WorkflowContext) -> MatchResult:
+        """Match with jobs"""
+        return await self.matcher.run([{"role":"user", "content": workflow_context}])
+
+    async def _screen(self, workflow_context: WorkflowContext) -> ScreeningResult:
+        """Screen candidate on the profile alone, so it can run alongside matching"""
+        return await self.screener.run([{"role": "user", "content": workflow_context}])
+
+    async def _screen_matches(self, workflow_context: WorkflowContext) -> ScreeningResult:
+        """Complete the screening with the job match results"""
+        return await self.screener.review_matches(workflow_context)
+
+    async def _recommend(self, workflow_context: WorkflowContext) -> RecommendationResult:
+        """Generate recommendations from the results of every other stage"""
+        return await self.recommender.run([{"role": "user", "content": workflow_context}])
+
+    async def process_batch(
+        self,
+        file_paths: List[str],
+        max_concurrency: int = 4,
+        output_path: Optional[str] = None,
+        progress_callback: Optional[Callable[[str, str], None]] = None,
+    ) -> Dict[str, Any]:
+        """Process many resumes concurrently, writing each result as soon as it is ready"""
+        print(f"Orchestrator: Starting batch of {len(file_paths)} resumes")
+
+        #Limit how many resumes are in the pipeline at once; Ollama calls are limited separately
+        semaphore = asyncio.Semaphore(max_concurrency)
+        stage_counts = {stage: 0 for stage in STAGES}
+        summary = {"total": len(file_paths), "completed": 0, "failed": 0}
+        output = open(output_path, "w", encoding="utf-8") if output_path else None
+        start = time.perf_counter()
+
+        async def process_one(file_path: str):
+            async with semaphore:
+                def on_stage(stage: str):
+                    stage_counts[stage] += 1
+                    if progress_callback:
+                        progress_callback(file_path, stage)
+
+                resume_data = {
+                    "file_path": file_path,
+                    "submission_timestamp": datetime.now().isoformat(),
                 }
-            )
+                try:
+                    result = await self.process_application(resume_data, progress_callback=on_stage)
+                    summary["completed"] += 1
+                except Exception as e:
+                    print(f"Orchestrator: Failed to process {file_path}: {str(e)}")
+                    result = {"resume_data": resume_data, "status": "failed", "error": str(e)}
+                    summary["failed"] += 1
+                    if progress_callback:
+                        progress_callback(file_path, "failed")
 
-            #Generate recommendations
-            final_recommendation = await self.recommender.run(
-                [{"role": "user", "content": str(workflow_context)}]
-            )
-            workflow_context.update(
-                {"final_recommendation": final_recommendation, "status": "completed"}
-            )
+                #Write one JSON line per resume so finished results survive an interrupted batch
+                if output:
+                    output.write(json.dumps(result, default=str) + "\n")
+                    output.flush()
 
-            return workflow_context
+        try:
+            await asyncio.gather(*(process_one(file_path) for file_path in file_paths))
+        finally:
+            if output:
+                output.close()
 
-        except Exception as e:
-            workflow_context.update({"status": "failed", "error:":str(e)})
-            raise
\ No newline at end of file
+        elapsed = time.perf_counter() - start
+        summary.update(
+            {
+                "stage_counts": stage_counts,
+                "elapsed_seconds": round(elapsed, 2),
+                "resumes_per_minute": round(summary["completed"] / elapsed * 60, 2) if elapsed > 0 else 0.0,
+            }
+        )
+        return summary
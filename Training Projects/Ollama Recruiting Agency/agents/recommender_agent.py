@@ -1,5 +1,7 @@
 from typing import Dict, Any
 from .base_agent import BaseAgent
+from .context_builder import ContextBuilder
+from .messages import RecommendationResult, WorkflowContext
 import datetime
 
 class RecommenderAgent(BaseAgent):
@@ -15,16 +17,21 @@ class RecommenderAgent(BaseAgent):
             Provide clear next steps and specific recommendations.
             """,
         )
+        #Every earlier stage's output, shortened to fit the prompt budget
+        self.context_builder = ContextBuilder(
+            ["extracted_data", "analysis_results", "job_matches", "screening_results"],
+            max_tokens=2500,
+        )
 
-    async def run(self, messages: list)->Dict[str,Any]:
+    async def run(self, messages: list)->RecommendationResult:
         """Generate final recommendations"""
         print("Recommender: Generating final recommendations")
 
-        workflow_context = eval(messages[-1]["content"])
-        recommendation = self._query_ollama(str(workflow_context))
+        workflow_context: WorkflowContext = messages[-1]["content"]
+        recommendation = await self._aquery_ollama(self.context_builder.build(workflow_context))
 
-        return {
-            "final_recommendation": recommendation,
-            "recommendation_timestamp": datetime.datetime.now(),
-            "confindence_level": "high", 
-        }
\ No newline at end of file
+        return RecommendationResult(
+            final_recommendation=recommendation,
+            recommendation_timestamp=datetime.datetime.now(),
+            confidence_level="high",
+        )
\ No newline at end of file
@@ -0,0 +1,191 @@
+from typing import Dict, Any, List, Optional, Tuple
+import sqlite3
+import threading
+import numpy as np
+from scipy import sparse
+from db.database import JobDatabase
+from db.skills import normalize_skill, normalize_skills
+from db.skill_vectors import SkillVectorStore
+
+MODES = ["exact", "semantic"]
+#Most candidate skills embedded per search in semantic mode; skills named exactly as a job skill don't count
+MAX_SEMANTIC_SKILLS = 50
+
+class JobScoringEngine:
+    """Score a candidate against every job at once using a sparse job x skill matrix"""
+    def __init__(self, db: JobDatabase, vector_store: Optional[SkillVectorStore] = None):
+        self.db = db
+        self.vector_store = vector_store
+        #Embeddings of the matrix's skill columns, loaded on the first semantic search
+        self.skill_vectors = None
+        self.jobs: List[Dict[str, Any]] = []
+        self.skill_columns: Dict[str, int] = {}
+        self.matrix = sparse.csr_matrix((0, 0), dtype=np.int32)
+        self.required_counts = np.zeros(0, dtype=np.int32)
+        self.experience_levels = np.zeros(0, dtype=object)
+        #Matrix row of each job ID, to map skill index lookups onto the matrix
+        self.job_rows: Dict[int, int] = {}
+        self._loaded_state = None
+        #Connection kept open only to read PRAGMA data_version, which is per connection
+        self._state_conn = None
+        #Matcher calls may come from several worker threads at once during batch runs
+        self.lock = threading.Lock()
+
+    def _jobs_state(self) -> int:
+        """Change counter of the database, bumped by every commit of another connection (edits included).
+        Must be called with self.lock held"""
+        if self._state_conn is None:
+            self._state_conn = sqlite3.connect(self.db.db_path, check_same_thread=False)
+        return self._state_conn.execute("PRAGMA data_version").fetchone()[0]
+
+    def load(self):
+        """Build the job x skill matrix from the jobs in the database"""
+        #Read the counter first, so a change made while loading triggers another rebuild
+        loaded_state = self._jobs_state()
+        jobs = self.db.get_all_jobs()
+        skill_columns = {}
+        rows, cols = [], []
+        required_counts = []
+
+        for row, job in enumerate(jobs):
+            required = normalize_skills(job["requirements"])
+            required_counts.append(len(required))
+            for skill in required:
+                rows.append(row)
+                cols.append(skill_columns.setdefault(skill, len(skill_columns)))
+
+        self.jobs = jobs
+        self.skill_columns = skill_columns
+        self.matrix = sparse.csr_matrix(
+            (np.ones(len(rows), dtype=np.int32), (rows, cols)),
+            shape=(len(jobs), len(skill_columns)),
+        )
+        self.required_counts = np.array(required_counts, dtype=np.int32)
+        self.experience_levels = np.array([job["experience_level"].lower() for job in jobs], dtype=object)
+        self.job_rows = {job["id"]: row for row, job in enumerate(jobs)}
+        self.skill_vectors = None
+        self._loaded_state = loaded_state
+
+    def refresh_if_stale(self):
+        """Rebuild the matrix if the database changed since it was built"""
+        if self._loaded_state != self._jobs_state():
+            self.load()
+
+    def score(
+        self,
+        skills: List[str],
+        experience_level: str,
+        top_k: int = 3,
+        min_score: int = 10,
+        mode: str = "exact",
+        similarity_threshold: float = 0.75,
+    ) -> Tuple[List[Tuple[Dict[str, Any], int]], int]:
+        """Return the top_k (job, match score %) pairs and the number of jobs scoring at least min_score"""
+        if mode not in MODES:
+            raise ValueError(f"Unknown matching mode '{mode}', expected one of {MODES}")
+
+        #Only the rebuild is locked; load() replaces the arrays instead of changing them, so the
+        #references taken here stay consistent while embedding calls run without the lock
+        with self.lock:
+            self.refresh_if_stale()
+            jobs, skill_columns, matrix = self.jobs, self.skill_columns, self.matrix
+            required_counts, experience_levels = self.required_counts, self.experience_levels
+            skill_vectors, job_rows = self.skill_vectors, self.job_rows
+        if not jobs:
+            return [], 0
+
+        #Matrix rows to score; semantic matching credits skills a job doesn't list, so it scores them all
+        rows = None
+
+        candidate = None
+        if mode == "semantic":
+            try:
+                candidate = self._semantic_candidate(skill_columns, skill_vectors, skills, similarity_threshold)
+            except Exception as e:
+                #Matching never needed the network before; an unavailable embedding model shouldn't fail it
+                print(f"Semantic matching failed, falling back to exact matching: {str(e)}")
+        if candidate is None:
+            #Only jobs sharing a skill at the right level can score; find them in the skill index.
+            #IDs missing from the matrix belong to jobs added since it was built
+            job_ids = self.db.get_job_ids_with_skills(skills, experience_level)
+            rows = np.array(sorted(job_rows[i] for i in job_ids if i in job_rows), dtype=np.int64)
+            if len(rows) == 0:
+                return [], 0
+            matrix = matrix[rows]
+            required_counts, experience_levels = required_counts[rows], experience_levels[rows]
+
+            #Candidate as a 0/1 vector over the known skills; skills no job asks for can't add overlap
+            candidate = np.zeros(len(skill_columns), dtype=np.int32)
+            columns = [skill_columns[s] for s in map(normalize_skill, skills) if s in skill_columns]
+            candidate[columns] = 1
+
+        #Shared skills with every scored job in one sparse matrix-vector product
+        overlap = matrix @ candidate
+        scores = np.floor(
+            overlap * 100 / np.maximum(required_counts, 1) + 1e-9
+        ).astype(np.int64)
+
+        eligible = (
+            (experience_levels == experience_level.lower())
+            & (overlap > 0)
+            & (scores >= min_score)
+        )
+        candidates = np.flatnonzero(eligible)
+        number_of_matches = len(candidates)
+        if number_of_matches == 0 or top_k <= 0:
+            return [], number_of_matches
+
+        #Partial sort: only the best top_k are ordered, by score, then shared skills, then job order.
+        #Jobs tied with the top_k-th score are all kept, so the tie-breaks decide which ones make it
+        if number_of_matches > top_k:
+            kth_score = -np.partition(-scores[candidates], top_k - 1)[top_k - 1]
+            candidates = candidates[scores[candidates] >= kth_score]
+        order = np.lexsort((candidates, -overlap[candidates], -scores[candidates]))
+        top = candidates[order][:top_k]
+
+        #Positions in the scored rows, mapped back to jobs
+        job_indices = top if rows is None else rows[top]
+        return [(jobs[j], int(scores[i])) for i, j in zip(top, job_indices)], number_of_matches
+
+    def _job_skill_vectors(self, skill_columns: Dict[str, int], skill_vectors: Optional[np.ndarray]) -> np.ndarray:
+        """Embeddings of the matrix's skill columns, computed once per matrix. The first semantic
+        search embeds and stores any job skills missing from the store, e.g. of jobs seeded in exact mode"""
+        if skill_vectors is None:
+            job_skills = sorted(skill_columns, key=skill_columns.get)
+            skill_vectors = self.vector_store.get_matrix(job_skills)
+            with self.lock:
+                #Keep them only if the matrix wasn't rebuilt in the meantime
+                if self.skill_columns is skill_columns:
+                    self.skill_vectors = skill_vectors
+        return skill_vectors
+
+    def _semantic_candidate(
+        self,
+        skill_columns: Dict[str, int],
+        skill_vectors: Optional[np.ndarray],
+        skills: List[str],
+        similarity_threshold: float,
+    ) -> np.ndarray:
+        """Weight of each job skill: its best cosine similarity to a candidate skill, if above the threshold"""
+        if self.vector_store is None:
+            raise ValueError("Semantic matching needs a SkillVectorStore")
+        if not skill_columns:
+            return np.zeros(0, dtype=np.float32)
+
+        #Job skills are embedded once; they only change when the jobs do
+        job_vectors = self._job_skill_vectors(skill_columns, skill_vectors)
+
+        #Skills named exactly as a job skill are full matches without embedding them
+        candidate_skills = normalize_skills(skills)
+        weights = np.zeros(len(skill_columns), dtype=np.float32)
+        weights[[skill_columns[skill] for skill in candidate_skills if skill in skill_columns]] = 1.0
+        other_skills = [skill for skill in candidate_skills if skill not in skill_columns][:MAX_SEMANTIC_SKILLS]
+        if not other_skills:
+            return weights
+
+        #Exact nearest-neighbour search: all job skills against the remaining candidate skills in one
+        #product, over the distinct job skills rather than the jobs, which stays small enough to need no ANN index.
+        #Candidate skills are embedded in memory only, so the stored table holds job skills alone
+        candidate_vectors = self.vector_store.get_matrix(other_skills, persist=False)
+        best = (job_vectors @ candidate_vectors.T).max(axis=1)
+        return np.maximum(weights, np.where(best >= similarity_threshold, best, 0.0)).astype(np.float32)
@@ -1,5 +1,8 @@
 from typing import Dict,Any
+from dataclasses import replace
 from .base_agent import BaseAgent
+from .context_builder import ContextBuilder
+from .messages import ScreeningResult, WorkflowContext
 import datetime
 
 #Define ScreenerAgent class inheriting from BaseAgent
@@ -12,25 +15,44 @@ class ScreenerAgent(BaseAgent):
                 Screen candidates based on:
                 - Qualification alignment
                 - Experience relevance
-                - Skill match percentage
                 - Cultural fit indicators
                 - Red flags or concerns
                 Provide comprehensive screening reports.
                 """,
             )
+        #Profile screening only needs the candidate profile, kept within a small prompt budget;
+        #the skill match percentage is added from the job matches afterwards, without the model
+        self.context_builder = ContextBuilder(["extracted_data", "analysis_results"], max_tokens=1500)
         
-    async def run(self,messages:list)-> Dict[str,Any]:
+    async def run(self,messages:list)-> ScreeningResult:
         """Screen the candidate"""
         print("Screener: Conducting initial screening")
 
-        # Retrieve and parse context information from last message content:
-        workflow_context = eval(messages[-1]["content"],{"datetime":datetime})    #Evaluate string representation to dictionary
+        # The last message carries the workflow context, shared by reference
+        workflow_context: WorkflowContext = messages[-1]["content"]
         
-        #Perform actual querying/analysis of candidates based on parsed context.
-        screening_results = self._query_ollama(str(workflow_context))
+        #Perform actual querying/analysis of candidates based on the profile; job matches may still be running
+        screening_results = await self._aquery_ollama(self.context_builder.build(workflow_context))
 
-        return {
-            "screening_report": screening_results,  #Report containing the results of candidate's analysis/screening
-            "screening_timestamp": datetime.datetime.now(),  #Current time stamp
-            "screening_score": 85,                  #Example score to indicate overall suitability or a numerical rating.
-        }
\ No newline at end of file
+        return ScreeningResult(
+            screening_report=screening_results,  #Report containing the results of candidate's analysis/screening
+            screening_timestamp=datetime.datetime.now(),  #Current time stamp
+            screening_score=85,                  #Example score to indicate overall suitability or a numerical rating.
+        )
+
+    async def review_matches(self, workflow_context: WorkflowContext) -> ScreeningResult:
+        """Add the job match criteria to the profile screening once matching has finished"""
+        print("Screener: Adding job match results to the screening")
+
+        screening = workflow_context.screening_results
+        matched_jobs = workflow_context.job_matches.matched_jobs if workflow_context.job_matches else []
+        #Matched jobs are sorted best first, with scores like "60%"
+        skill_match = int(matched_jobs[0]["match_score"].rstrip("%")) if matched_jobs else 0
+
+        lines = [f"- {job['title']}: {job['match_score']} skill match" for job in matched_jobs]
+        match_section = "\n".join(["", "", f"Skill match percentage: {skill_match}%", *lines])
+        return replace(
+            screening,
+            screening_report=screening.screening_report + match_section,
+            skill_match_percentage=skill_match,
+        )
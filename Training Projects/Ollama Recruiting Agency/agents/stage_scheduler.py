@@ -0,0 +1,94 @@
+from typing import Dict, Any, Awaitable, Callable, List, Optional
+import asyncio
+import time
+
+class Stage:
+    """A pipeline stage: an async function of the workflow context and the stages it depends on"""
+    def __init__(
+        self,
+        name: str,
+        func: Callable[[Any], Awaitable[Any]],
+        output_key: str,
+        depends_on: Optional[List[str]] = None,
+    ):
+        self.name = name
+        self.func = func
+        self.output_key = output_key
+        self.depends_on = list(depends_on or [])
+
+class StageScheduler:
+    """Run a DAG of stages, starting each one as soon as all of its dependencies have finished"""
+    def __init__(self, stages: List[Stage]):
+        self.stages = self._sort_stages(stages)
+
+    def _sort_stages(self, stages: List[Stage]) -> List[Stage]:
+        """Order stages so every stage comes after its dependencies, rejecting unknown names and cycles"""
+        by_name = {stage.name: stage for stage in stages}
+        if len(by_name) != len(stages):
+            raise ValueError("Stage names must be unique")
+
+        ordered = []
+        state = {}  #name -> "visiting" or "done"
+
+        def visit(stage: Stage):
+            if state.get(stage.name) == "done":
+                return
+            if state.get(stage.name) == "visiting":
+                raise ValueError(f"Stage dependency cycle at '{stage.name}'")
+            state[stage.name] = "visiting"
+            for dependency in stage.depends_on:
+                if dependency not in by_name:
+                    raise ValueError(f"Stage '{stage.name}' depends on unknown stage '{dependency}'")
+                visit(by_name[dependency])
+            state[stage.name] = "done"
+            ordered.append(stage)
+
+        for stage in stages:
+            visit(stage)
+        return ordered
+
+    async def run(
+        self,
+        context: Any,
+        progress_callback: Optional[Callable[[str], None]] = None,
+    ) -> Dict[str, Dict[str, float]]:
+        """Run every stage, storing each result on the context under its output key, and return the stage timings"""
+        start = time.perf_counter()
+        timings = {}
+        tasks = {}
+
+        async def run_stage(stage: Stage):
+            #Wait for the stages this one depends on
+            if stage.depends_on:
+                await asyncio.gather(*(tasks[dependency] for dependency in stage.depends_on))
+
+            stage_start = time.perf_counter()
+            context.current_stage = stage.name
+            setattr(context, stage.output_key, await stage.func(context))
+            stage_end = time.perf_counter()
+
+            timings[stage.name] = {
+                "start": round(stage_start - start, 3),
+                "end": round(stage_end - start, 3),
+                "duration": round(stage_end - stage_start, 3),
+            }
+            if progress_callback:
+                progress_callback(stage.name)
+
+        #Stages are sorted, so the tasks a stage waits on always exist when it is created
+        for stage in self.stages:
+            tasks[stage.name] = asyncio.create_task(run_stage(stage))
+
+        #Stop everything as soon as one stage fails
+        done, pending = await asyncio.wait(tasks.values(), return_when=asyncio.FIRST_EXCEPTION)
+        for task in pending:
+            task.cancel()
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+        errors = [task.exception() for task in tasks.values() if task in done and not task.cancelled()]
+        errors = [error for error in errors if error is not None]
+        if errors:
+            #Report the failure of the earliest stage, not of a stage that was waiting on it
+            raise errors[0]
+
+        return timings
@@ -6,6 +6,7 @@ from datetime import datetime
 from pathlib import Path
 from streamlit_option_menu import option_menu
 from agents.orchestrator import OrchestratorAgent
+from agents.base_agent import BaseAgent
 from utils.logger import setup_logger
 from utils.exceptions import ResumeProcessError
 
@@ -58,6 +59,9 @@ async def process_resume(file_path: str)->dict:
     except Exception as e:
         logger.error(f"Error processing resume: {str(e)}")
         raise
+    finally:
+        #asyncio.run() ends the event loop after each upload, so release its connections now
+        await BaseAgent.close_async_client()
 
 def save_uploaded_file(uploaded_file)->str:
     """Save uploaded file and return the file path"""
@@ -0,0 +1,77 @@
+#Command line batch processing of a directory of resumes
+import argparse
+import asyncio
+import sys
+from collections import Counter
+from pathlib import Path
+from agents.orchestrator import OrchestratorAgent, STAGES
+from agents.base_agent import BaseAgent
+
+def parse_args():
+    """Parse command line arguments"""
+    parser = argparse.ArgumentParser(
+        description="Run every PDF resume in a directory through the AI recruitment pipeline"
+    )
+    parser.add_argument("directory", help="Directory containing the PDF resumes")
+    parser.add_argument(
+        "-o", "--output", default="batch_results.jsonl",
+        help="JSON Lines file the results are written to, one line per resume",
+    )
+    parser.add_argument(
+        "-c", "--concurrency", type=int, default=4,
+        help="Maximum number of resumes processed at the same time",
+    )
+    parser.add_argument(
+        "-r", "--recursive", action="store_true",
+        help="Also look for resumes in subdirectories",
+    )
+    return parser.parse_args()
+
+def main()->int:
+    args = parse_args()
+
+    directory = Path(args.directory)
+    if not directory.is_dir():
+        print(f"Not a directory: {directory}")
+        return 1
+
+    pattern = "**/*.pdf" if args.recursive else "*.pdf"
+    file_paths = sorted(str(path) for path in directory.glob(pattern))
+    if not file_paths:
+        print(f"No PDF resumes found in {directory}")
+        return 1
+
+    total = len(file_paths)
+    progress = Counter()
+
+    def on_progress(file_path: str, stage: str):
+        #Print how many resumes have finished each stage so far
+        progress[stage] += 1
+        print(f"[{stage} {progress[stage]}/{total}] {Path(file_path).name}")
+
+    async def run_batch()->dict:
+        orchestrator = OrchestratorAgent()
+        try:
+            return await orchestrator.process_batch(
+                file_paths,
+                max_concurrency=args.concurrency,
+                output_path=args.output,
+                progress_callback=on_progress,
+            )
+        finally:
+            #Close Ollama connections before asyncio.run() ends the event loop
+            await BaseAgent.close_async_client()
+
+    summary = asyncio.run(run_batch())
+
+    print("\nBatch complete")
+    print(f"  {'Resumes:':<16}{summary['completed']} completed, {summary['failed']} failed, {summary['total']} total")
+    for stage in STAGES:
+        print(f"  {stage.capitalize() + ':':<16}{summary['stage_counts'][stage]}/{total}")
+    print(f"  {'Elapsed:':<16}{summary['elapsed_seconds']}s")
+    print(f"  {'Throughput:':<16}{summary['resumes_per_minute']} resumes/min")
+    print(f"  {'Results:':<16}{args.output}")
+    return 0 if summary["failed"] == 0 else 2
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,78 @@
+#Benchmark the PDF text extraction backends on a directory of sample resumes
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+from utils.exceptions import ExtractionError
+from utils.pdf_extraction import BACKENDS, PdfExtractor, pymupdf
+
+def parse_args():
+    """Parse command line arguments"""
+    parser = argparse.ArgumentParser(description="Compare PDF text extraction backends on sample resumes")
+    parser.add_argument("directory", help="Directory containing sample PDF resumes")
+    parser.add_argument(
+        "-b", "--backends", nargs="+", default=None,
+        help=f"Backends to compare (default: every available one of {', '.join(BACKENDS)})",
+    )
+    parser.add_argument("-n", "--rounds", type=int, default=3, help="Timed rounds per backend")
+    parser.add_argument("-w", "--workers", type=int, default=None, help="Worker processes for parallel backends")
+    parser.add_argument("--max-pages", type=int, default=20, help="Page limit per resume")
+    parser.add_argument(
+        "-c", "--concurrency", type=int, default=1,
+        help="Resumes extracted at the same time, as in a batch run",
+    )
+    return parser.parse_args()
+
+async def run_round(extractor: PdfExtractor, documents: list, concurrency: int):
+    """Extract every document once; return the characters extracted per file and the failures"""
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def extract_one(pdf_bytes: bytes):
+        async with semaphore:
+            try:
+                return len(await extractor.extract(pdf_bytes))
+            except ExtractionError as e:
+                print(f"  {extractor.backend}: {str(e)}")
+                return None
+
+    return await asyncio.gather(*(extract_one(pdf_bytes) for pdf_bytes in documents))
+
+async def benchmark(args, documents: list):
+    backends = args.backends or [b for b in BACKENDS if b != "pymupdf" or pymupdf is not None]
+
+    print(f"{'Backend':<20}{'Best (s)':>10}{'Mean (s)':>10}{'ms/file':>10}{'Chars':>12}{'Failed':>8}")
+    for backend in backends:
+        extractor = PdfExtractor(backend=backend, max_workers=args.workers, max_pages=args.max_pages)
+
+        #Warm up once so starting worker processes isn't counted
+        await run_round(extractor, documents[:1], 1)
+
+        timings = []
+        for _ in range(args.rounds):
+            start = time.perf_counter()
+            sizes = await run_round(extractor, documents, args.concurrency)
+            timings.append(time.perf_counter() - start)
+
+        best = min(timings)
+        failed = sum(size is None for size in sizes)
+        chars = sum(size for size in sizes if size is not None)
+        print(
+            f"{backend:<20}{best:>10.3f}{sum(timings) / len(timings):>10.3f}"
+            f"{best / len(documents) * 1000:>10.1f}{chars:>12}{failed:>8}"
+        )
+
+def main()->int:
+    args = parse_args()
+    file_paths = sorted(Path(args.directory).glob("*.pdf"))
+    if not file_paths:
+        print(f"No PDF files found in {args.directory}")
+        return 1
+
+    documents = [path.read_bytes() for path in file_paths]
+    print(f"{len(documents)} resumes, {sum(len(d) for d in documents) // 1024} KB, {args.rounds} rounds\n")
+    asyncio.run(benchmark(args, documents))
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
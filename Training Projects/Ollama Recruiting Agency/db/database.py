@@ -1,21 +1,39 @@
 import sqlite3
 from pathlib import Path
-from typing import Dict,List,Any
+from typing import Dict,List,Any,Optional
 import json
 import os
+from db.skills import normalize_skills
+from db.skill_vectors import SkillVectorStore
+
+#Stored in PRAGMA user_version once the database has been migrated to it
+#1: skills of existing jobs indexed in job_skills
+SCHEMA_VERSION = 1
 
 class JobDatabase:
-    def __init__(self):
+    def __init__(self, db_path: Optional[str] = None, embed_skills: Optional[bool] = None):
         #Determine the directory where this script (JobDatabase class)
         current_dir = Path(__file__).parent
 
         #Define paths to database file and schema SQL file based on the location of the current script.
-        self.db_path = current_dir / "jobs.sqllite"
+        self.db_path = Path(db_path) if db_path else current_dir / "jobs.sqllite"
         self.schema_path = current_dir / "schema.sql"
 
         #Initialize the database with its predefined schema.
         self._init_db()
 
+        #Optional embeddings of job skills for semantic matching, kept up to date by add_job;
+        #on by default when the app matches semantically, so seeded jobs are embedded as they are added
+        if embed_skills is None:
+            embed_skills = os.getenv("MATCH_MODE", "exact") == "semantic"
+        self.vector_store = SkillVectorStore(self.db_path) if embed_skills else None
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open a connection with foreign keys enforced, so deleting a job also drops its skill index rows"""
+        conn = sqlite3.connect(self.db_path)
+        conn.execute("PRAGMA foreign_keys = ON")
+        return conn
+
     def _init_db(self):
         """Initialize the database with schema"""
         if not self.schema_path.exists():
@@ -26,9 +44,33 @@ class JobDatabase:
             schema = f.read()
 
         #Connect to the SQLite database, executre the schema, and commit it (if necessary).
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
             conn.executescript(schema)
 
+            #One-off migrations, so opening an up to date database doesn't scan the jobs table
+            user_version = conn.execute("PRAGMA user_version").fetchone()[0]
+            if user_version < SCHEMA_VERSION:
+                self._backfill_skills(conn)
+                conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+    def _backfill_skills(self, conn: sqlite3.Connection):
+        """Index the skills of jobs added before the job_skills table existed"""
+        rows = conn.execute(
+            """
+            SELECT id, requirements FROM jobs
+            WHERE NOT EXISTS (SELECT 1 FROM job_skills WHERE job_skills.job_id = jobs.id)
+            """
+        ).fetchall()
+        for job_id, requirements in rows:
+            self._index_skills(conn, job_id, json.loads(requirements))
+
+    def _index_skills(self, conn: sqlite3.Connection, job_id: int, requirements: List[str]):
+        """Add a job's canonical skills to the inverted skill index"""
+        conn.executemany(
+            "INSERT OR IGNORE INTO job_skills(skill, job_id) VALUES (?, ?)",
+            [(skill, job_id) for skill in normalize_skills(requirements)],
+        )
+
     def add_job(self, job_data: Dict[str,Any])->int:
         """Add a new job to the database"""
         query = """
@@ -39,7 +81,7 @@ class JobDatabase:
             """
         
         # Connnect to the SQLite database and execute an insert statement with the provided job data.
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
             cursor = conn.cursor()
             cursor.execute(
                 query,(
@@ -54,15 +96,26 @@ class JobDatabase:
                     json.dumps(job_data.get("benefits",[])),
                 ),
             )
-            #Return the ID of the newly inserted row
-            return cursor.lastrowid
+            #Index the job's skills in the same transaction
+            self._index_skills(conn, cursor.lastrowid, job_data["requirements"])
+            job_id = cursor.lastrowid
+
+        #Embed any new skills; if Ollama is unavailable they are embedded on the next semantic search
+        if self.vector_store is not None:
+            try:
+                self.vector_store.add_skills(job_data["requirements"])
+            except Exception as e:
+                print(f"Error embedding job skills: {e}")
+
+        #Return the ID of the newly inserted row
+        return job_id
         
     def get_all_jobs(self)-> List[Dict[str,Any]]:
         """Retrieve all jobs from the database"""
         query = "SELECT * FROM jobs ORDER BY created_at DESC"
 
         #Connnect to the SQLite database and execute a select statement that retrieves all job data.
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
             conn.row_factory = sqlite3.Row
             cursor = conn.cursor()
             cursor.execute(query)
@@ -86,28 +139,44 @@ class JobDatabase:
                 for row in rows
             ]
         
-    def search_jobs(self, skills: List[str],experience_level: str) -> List[Dict[str,Any]]:
-        """Search jobs based on skills and experience level"""
-        query = """
-            SELECT * FROM jobs
-            WHERE experience_level = ?
-            AND (
+    def get_job_ids_with_skills(self, skills: List[str], experience_level: str) -> List[int]:
+        """IDs of the jobs at the given experience level requiring any of the skills, looked up in the skill index"""
+        canonical_skills = normalize_skills(skills)
+        if not canonical_skills:
+            return []
+
+        placeholders = ",".join("?" * len(canonical_skills))
+        query = f"""
+            SELECT DISTINCT jobs.id
+            FROM job_skills
+            JOIN jobs ON jobs.id = job_skills.job_id
+            WHERE job_skills.skill IN ({placeholders})
+            AND LOWER(jobs.experience_level) = LOWER(?)
             """
-        
-        # Initialize the list for SQL conditions and parameters to be used in the SQL statement.
-        query_conditions = []
-        params = [experience_level]
+        with self._connect() as conn:
+            return [row[0] for row in conn.execute(query, [*canonical_skills, experience_level])]
 
-        #Create LIKE conditions for each skill provided in the search criteria.
-        for skill in skills:
-            query_conditions.append("requirements LIKE ?")
-            params.append(f"%{skill}%")
+    def search_jobs(self, skills: List[str],experience_level: str) -> List[Dict[str,Any]]:
+        """Search jobs requiring any of the skills at the given experience level, most shared skills first"""
+        #Look the candidate's canonical skills up in the skill index instead of scanning requirements text
+        canonical_skills = normalize_skills(skills)
+        if not canonical_skills:
+            return []
 
-        #Append all generated conditions to the main SQL query with 'OR' logic between them.
-        query += " OR ".join(query_conditions) + ")"
+        placeholders = ",".join("?" * len(canonical_skills))
+        query = f"""
+            SELECT jobs.*, COUNT(*) AS skill_overlap
+            FROM job_skills
+            JOIN jobs ON jobs.id = job_skills.job_id
+            WHERE job_skills.skill IN ({placeholders})
+            AND LOWER(jobs.experience_level) = LOWER(?)
+            GROUP BY jobs.id
+            ORDER BY skill_overlap DESC, jobs.id
+            """
+        params = [*canonical_skills, experience_level]
 
         try:
-            with sqlite3.connect(self.db.db_path) as conn:
+            with self._connect() as conn:
                 conn.row_factory = sqlite3.Row
                 cursor = conn.cursor()
                 cursor.execute(query,params)
@@ -128,9 +197,10 @@ class JobDatabase:
                         "benefits": (
                             json.loads(row["benefits"]) if row["benefits"] else[]
                         ),
+                        "skill_overlap": row["skill_overlap"],
                     }
                     for row in rows
                 ]
         except Exception as e:
             print(f"Error searching jobs: {e}")
-            return []
\ No newline at end of file
+            return []
@@ -0,0 +1,70 @@
+import sqlite3
+import hashlib
+import json
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Optional
+
+class ResultCache:
+    def __init__(self, db_path: Optional[str] = None):
+        #Keep the cache next to the jobs database unless told otherwise
+        self.db_path = Path(db_path) if db_path else Path(__file__).parent / "result_cache.sqlite"
+        self._init_db()
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open a connection; WAL mode lets the app and batch runs read while another process writes"""
+        conn = sqlite3.connect(self.db_path, timeout=10)
+        conn.execute("PRAGMA journal_mode=WAL")
+        return conn
+
+    def _init_db(self):
+        """Create the results table if it doesn't exist"""
+        with self._connect() as conn:
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS stage_results(
+                    content_hash TEXT NOT NULL,
+                    stage TEXT NOT NULL,
+                    version TEXT NOT NULL,
+                    result TEXT NOT NULL,
+                    created_at TEXT NOT NULL,
+                    PRIMARY KEY (content_hash, stage, version)
+                )
+                """
+            )
+
+    @staticmethod
+    def content_hash(data: Any) -> str:
+        """SHA-256 of bytes or text, used to recognize the same resume or stage input"""
+        if isinstance(data, str):
+            data = data.encode("utf-8")
+        return hashlib.sha256(data).hexdigest()
+
+    @staticmethod
+    def version(*parts: str) -> str:
+        """Short hash of everything that shapes a result, e.g. the model name and prompts"""
+        return hashlib.sha256("\x00".join(parts).encode("utf-8")).hexdigest()[:16]
+
+    def get(self, content_hash: str, stage: str, version: str) -> Optional[Any]:
+        """Return the cached result of a stage for this content and version, or None"""
+        try:
+            with self._connect() as conn:
+                row = conn.execute(
+                    "SELECT result FROM stage_results WHERE content_hash = ? AND stage = ? AND version = ?",
+                    (content_hash, stage, version),
+                ).fetchone()
+        except sqlite3.Error as e:
+            print(f"Error reading result cache: {e}")
+            return None
+        return json.loads(row[0]) if row else None
+
+    def set(self, content_hash: str, stage: str, version: str, result: Any):
+        """Store the result of a stage for this content and version"""
+        try:
+            with self._connect() as conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO stage_results(content_hash, stage, version, result, created_at) VALUES (?,?,?,?,?)",
+                    (content_hash, stage, version, json.dumps(result), datetime.now().isoformat()),
+                )
+        except sqlite3.Error as e:
+            print(f"Error writing result cache: {e}")
@@ -11,4 +11,21 @@ CREATE TABLE IF NOT EXISTS jobs(
     benefits TEXT,
     created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
     updated_at DATETIME DEFAULT CURRENT_TIMESTAMP
-)
\ No newline at end of file
+);
+
+-- Inverted index from canonical skill name to the jobs requiring it
+CREATE TABLE IF NOT EXISTS job_skills(
+    skill TEXT NOT NULL,
+    job_id INTEGER NOT NULL REFERENCES jobs(id) ON DELETE CASCADE,
+    PRIMARY KEY (skill, job_id)
+) WITHOUT ROWID;
+
+CREATE INDEX IF NOT EXISTS idx_job_skills_job_id ON job_skills(job_id);
+
+-- Embeddings of canonical skill names for semantic matching, one row per skill and model
+CREATE TABLE IF NOT EXISTS skill_embeddings(
+    skill TEXT NOT NULL,
+    model TEXT NOT NULL,
+    vector BLOB NOT NULL,
+    PRIMARY KEY (skill, model)
+) WITHOUT ROWID;
@@ -0,0 +1,108 @@
+import sqlite3
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+import numpy as np
+from openai import OpenAI
+from db.skills import normalize_skills
+
+OLLAMA_BASE_URL = "http://localhost:11434/v1"
+#Embedding model served by Ollama, e.g. after `ollama pull nomic-embed-text`
+EMBEDDING_MODEL = os.getenv("OLLAMA_EMBED_MODEL", "nomic-embed-text")
+#Skills embedded per request
+EMBED_BATCH_SIZE = 256
+#Most vectors kept in memory only, least recently used dropped first
+MEMORY_VECTORS_MAX = 10000
+
+class SkillVectorStore:
+    """Persisted embeddings of canonical skill names, stored next to the jobs in SQLite"""
+    def __init__(self, db_path: Path, model: str = EMBEDDING_MODEL, client: Optional[OpenAI] = None):
+        self.db_path = db_path
+        self.model = model
+        self.client = client or OpenAI(base_url=OLLAMA_BASE_URL, api_key="ollama")
+        #Vectors already read from or written to the database by this process
+        self.vectors: Dict[str, np.ndarray] = {}
+        #Vectors embedded but not stored, e.g. of candidate skills no job asks for; an LRU cache
+        self.memory_vectors: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        #Matcher calls may come from several worker threads at once during batch runs
+        self.lock = threading.Lock()
+
+    def _load(self, skills: List[str]):
+        """Read stored vectors of the given skills into memory"""
+        with self.lock:
+            missing = [skill for skill in skills if skill not in self.vectors]
+        if not missing:
+            return
+        with sqlite3.connect(self.db_path) as conn:
+            #Stay under SQLite's limit on query parameters
+            for start in range(0, len(missing), 500):
+                chunk = missing[start:start + 500]
+                placeholders = ",".join("?" * len(chunk))
+                rows = conn.execute(
+                    f"SELECT skill, vector FROM skill_embeddings WHERE model = ? AND skill IN ({placeholders})",
+                    [self.model, *chunk],
+                ).fetchall()
+                with self.lock:
+                    for skill, blob in rows:
+                        self.vectors[skill] = np.frombuffer(blob, dtype=np.float32)
+
+    def add_skills(self, skills: Iterable[str], persist: bool = True) -> Dict[str, np.ndarray]:
+        """Embed the canonical skills that have no vector yet, a batch per request, and return the vectors
+        of all of them. With persist=False, e.g. for a candidate's skills, new vectors are only kept in
+        memory, not stored in the database"""
+        canonical = normalize_skills(skills)
+        self._load(canonical)
+        with self.lock:
+            found = {}
+            for skill in canonical:
+                if skill in self.vectors:
+                    found[skill] = self.vectors[skill]
+                elif skill in self.memory_vectors:
+                    self.memory_vectors.move_to_end(skill)
+                    found[skill] = self.memory_vectors[skill]
+        #Two threads may embed the same skill at once; both get the same vector
+        missing = [skill for skill in canonical if skill not in found]
+
+        embeddings = []
+        for start in range(0, len(missing), EMBED_BATCH_SIZE):
+            response = self.client.embeddings.create(
+                model=self.model, input=missing[start:start + EMBED_BATCH_SIZE]
+            )
+            embeddings.extend(item.embedding for item in response.data)
+        if embeddings:
+            vectors = np.array(embeddings, dtype=np.float32)
+            #Unit length, so a dot product is the cosine similarity
+            vectors /= np.maximum(np.linalg.norm(vectors, axis=1, keepdims=True), 1e-12)
+            found.update(zip(missing, vectors))
+
+        if not persist:
+            with self.lock:
+                for skill in missing:
+                    self.memory_vectors[skill] = found[skill]
+                while len(self.memory_vectors) > MEMORY_VECTORS_MAX:
+                    self.memory_vectors.popitem(last=False)
+            return found
+
+        #Store every requested skill not stored yet, including ones first embedded in memory only
+        with self.lock:
+            to_store = {skill: found[skill] for skill in canonical if skill not in self.vectors}
+        if to_store:
+            with sqlite3.connect(self.db_path) as conn:
+                conn.executemany(
+                    "INSERT OR REPLACE INTO skill_embeddings(skill, model, vector) VALUES (?, ?, ?)",
+                    [(skill, self.model, vector.tobytes()) for skill, vector in to_store.items()],
+                )
+            with self.lock:
+                self.vectors.update(to_store)
+                for skill in to_store:
+                    self.memory_vectors.pop(skill, None)
+        return found
+
+    def get_matrix(self, skills: List[str], persist: bool = True) -> np.ndarray:
+        """Unit vectors of canonical skills as rows of a matrix, embedding any that are missing"""
+        vectors = self.add_skills(skills, persist=persist)
+        if not skills:
+            return np.zeros((0, 0), dtype=np.float32)
+        return np.stack([vectors[skill] for skill in skills])
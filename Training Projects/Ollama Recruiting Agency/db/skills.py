@@ -0,0 +1,57 @@
+import re
+from typing import Iterable, List
+
+#Alternative spellings mapped to one canonical skill name
+SKILL_ALIASES = {
+    "js": "javascript",
+    "ecmascript": "javascript",
+    "ts": "typescript",
+    "py": "python",
+    "python3": "python",
+    "golang": "go",
+    "c sharp": "c#",
+    "cpp": "c++",
+    "node": "node.js",
+    "nodejs": "node.js",
+    "reactjs": "react",
+    "react.js": "react",
+    "vuejs": "vue",
+    "vue.js": "vue",
+    "postgres": "postgresql",
+    "mssql": "sql server",
+    "k8s": "kubernetes",
+    "amazon web services": "aws",
+    "gcp": "google cloud",
+    "google cloud platform": "google cloud",
+    "ml": "machine learning",
+    "ai": "artificial intelligence",
+    "nlp": "natural language processing",
+    "adobe cc": "adobe creative suite",
+    "agile": "agile methodologies",
+    "scrum": "agile methodologies",
+}
+
+#Qualifiers around a skill that don't change which skill it is
+_PREFIXES = re.compile(
+    r"^(?:basic |strong |good |solid )?(?:knowledge of|experience with|experience in|proficiency in|"
+    r"proficient in|familiarity with|understanding of) "
+)
+_SUFFIXES = re.compile(r" (?:skills|skill)$")
+_NOTES = re.compile(r"\s*\((?:preferred|optional|required|a plus)\)")
+
+def normalize_skill(skill: str) -> str:
+    """Canonical form of a skill name, e.g. ' ReactJS ' -> 'react', 'K8s' -> 'kubernetes'"""
+    name = " ".join(str(skill).lower().split())
+    name = _NOTES.sub("", name)
+    name = _PREFIXES.sub("", name)
+    name = _SUFFIXES.sub("", name)
+    return SKILL_ALIASES.get(name, name)
+
+def normalize_skills(skills: Iterable[str]) -> List[str]:
+    """Canonical, de-duplicated skill names, in their original order"""
+    seen = {}
+    for skill in skills:
+        name = normalize_skill(skill)
+        if name:
+            seen.setdefault(name, None)
+    return list(seen)
@@ -0,0 +1,159 @@
+import asyncio
+import io
+import os
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import List, Optional
+from pdfminer.high_level import extract_text
+from pdfminer.pdfdocument import PDFDocument
+from pdfminer.pdfparser import PDFParser
+from pdfminer.pdftypes import resolve1
+from utils.exceptions import ExtractionError
+
+#PyMuPDF is an optional extra (pip install pymupdf, see requirements.txt); it is much faster than pdfminer when installed
+try:
+    import pymupdf
+except ImportError:
+    pymupdf = None
+
+BACKENDS = ["pdfminer", "pdfminer-parallel", "pymupdf"]
+
+#Pages extracted by one worker; shorter documents aren't worth splitting
+PAGES_PER_WORKER = 2
+
+#Process pool shared by every extractor in this process, created on first use
+_process_pool = None
+_process_pool_workers = None
+
+def _recycle_process_pool():
+    """Kill the pool's workers and send new work to a fresh pool, e.g. when a worker is stuck on a document that timed out"""
+    global _process_pool
+    if _process_pool is not None:
+        #A hung worker would never exit by itself, so terminate the processes instead of waiting for them;
+        #other extractions still running on the old pool fail with BrokenProcessPool
+        processes = list((_process_pool._processes or {}).values())
+        _process_pool.shutdown(wait=False, cancel_futures=True)
+        for process in processes:
+            process.terminate()
+        _process_pool = None
+
+def _get_process_pool(max_workers: int) -> ProcessPoolExecutor:
+    """Return the shared process pool, recreating it if a different size is requested"""
+    global _process_pool, _process_pool_workers
+    if _process_pool is None or _process_pool_workers != max_workers:
+        if _process_pool is not None:
+            _process_pool.shutdown(wait=False, cancel_futures=True)
+        _process_pool = ProcessPoolExecutor(max_workers=max_workers)
+        _process_pool_workers = max_workers
+    return _process_pool
+
+def _count_pages_pdfminer(pdf_bytes: bytes) -> int:
+    """Read the page count from the document catalog without parsing the pages"""
+    document = PDFDocument(PDFParser(io.BytesIO(pdf_bytes)))
+    pages = resolve1(document.catalog["Pages"])
+    return int(resolve1(pages["Count"]))
+
+def _extract_pages_pdfminer(pdf_bytes: bytes, page_numbers: Optional[List[int]] = None) -> str:
+    """Extract the text of some pages (all when None) with pdfminer; runs in a worker process"""
+    return extract_text(io.BytesIO(pdf_bytes), page_numbers=page_numbers)
+
+def _count_pages_pymupdf(pdf_bytes: bytes) -> int:
+    with pymupdf.open(stream=pdf_bytes, filetype="pdf") as document:
+        return document.page_count
+
+def _extract_pages_pymupdf(pdf_bytes: bytes, page_numbers: Optional[List[int]] = None) -> str:
+    """Extract the text of some pages (all when None) with PyMuPDF; runs in a worker process"""
+    with pymupdf.open(stream=pdf_bytes, filetype="pdf") as document:
+        numbers = range(document.page_count) if page_numbers is None else page_numbers
+        return "".join(document[number].get_text() for number in numbers if number < document.page_count)
+
+class PdfExtractor:
+    """Extract text from PDF bytes with a pluggable backend, within size, page and time limits"""
+    def __init__(
+        self,
+        backend: str = "auto",
+        max_workers: Optional[int] = None,
+        max_bytes: int = 10 * 1024 * 1024,
+        max_pages: int = 20,
+        timeout: float = 60.0,
+    ):
+        if backend == "auto":
+            backend = "pymupdf" if pymupdf is not None else "pdfminer-parallel"
+        if backend not in BACKENDS:
+            raise ValueError(f"Unknown PDF backend '{backend}', expected one of {BACKENDS}")
+        if backend == "pymupdf" and pymupdf is None:
+            raise ValueError("The pymupdf backend needs PyMuPDF: pip install pymupdf")
+
+        self.backend = backend
+        self.max_workers = max_workers or min(4, os.cpu_count() or 1)
+        self.max_bytes = max_bytes
+        self.max_pages = max_pages
+        self.timeout = timeout
+
+    @property
+    def version(self) -> str:
+        """Identifies the extracted text, so cached text is redone when the backend or limits change"""
+        return f"{self.backend}-p{self.max_pages}-2"
+
+    async def extract(self, pdf_bytes: bytes) -> str:
+        """Extract the text of a PDF without blocking the event loop"""
+        global _process_pool
+        if len(pdf_bytes) > self.max_bytes:
+            raise ExtractionError(
+                f"PDF is {len(pdf_bytes) // 1024} KB, over the {self.max_bytes // 1024} KB limit"
+            )
+        try:
+            #Work already handed to a worker process keeps running after a timeout, but nobody waits for it
+            return await asyncio.wait_for(self._extract(pdf_bytes), timeout=self.timeout)
+        except asyncio.TimeoutError:
+            #The stuck worker would keep its slot forever, so kill it and don't queue more work behind it
+            _recycle_process_pool()
+            raise ExtractionError(f"PDF text extraction timed out after {self.timeout}s")
+        except ExtractionError:
+            raise
+        except BrokenProcessPool as e:
+            #A worker died (e.g. out of memory); start a fresh pool next time, unless a timeout already did
+            if _process_pool is not None and _process_pool._broken:
+                _process_pool = None
+            raise ExtractionError(f"PDF extraction worker crashed: {str(e)}") from e
+        except Exception as e:
+            raise ExtractionError(f"Could not extract text from PDF: {str(e)}") from e
+
+    async def _extract(self, pdf_bytes: bytes) -> str:
+        if self.backend == "pymupdf":
+            count_pages, extract_pages = _count_pages_pymupdf, _extract_pages_pymupdf
+        else:
+            count_pages, extract_pages = _count_pages_pdfminer, _extract_pages_pdfminer
+
+        #Counting pages only reads the document catalog, so it stays in a thread
+        try:
+            page_count = await asyncio.to_thread(count_pages, pdf_bytes)
+        except Exception as e:
+            print(f"Could not count PDF pages, extracting at most the first {self.max_pages}: {str(e)}")
+            page_count = None
+
+        if page_count == 0:
+            return ""
+        if page_count is not None and page_count > self.max_pages:
+            raise ExtractionError(f"PDF has {page_count} pages, over the {self.max_pages} page limit")
+
+        #Baseline: the whole document in one thread, as before
+        if self.backend == "pdfminer":
+            return await asyncio.to_thread(extract_pages, pdf_bytes, list(range(page_count or self.max_pages)))
+
+        if page_count is None:
+            #Pages past the end of a shorter document are skipped
+            chunks = [list(range(self.max_pages))]
+        else:
+            #Split the pages into contiguous chunks, one per worker process
+            pages = list(range(page_count))
+            chunk_count = max(1, min(self.max_workers, -(-page_count // PAGES_PER_WORKER)))
+            chunk_size = -(-page_count // chunk_count)
+            chunks = [pages[start:start + chunk_size] for start in range(0, page_count, chunk_size)]
+
+        loop = asyncio.get_running_loop()
+        pool = _get_process_pool(self.max_workers)
+        texts = await asyncio.gather(
+            *(loop.run_in_executor(pool, extract_pages, pdf_bytes, chunk) for chunk in chunks)
+        )
+        return "".join(texts)
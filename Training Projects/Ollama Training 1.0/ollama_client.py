@@ -0,0 +1,244 @@
+import json
+import logging
+import time
+import asyncio
+import requests
+import httpx
+from requests.adapters import HTTPAdapter
+
+#Constants
+OLLAMA_URL = "http://localhost:11434"
+DEFAULT_MODEL = "llama3.2"
+DEFAULT_KEEP_ALIVE = "30m"
+
+#Models already confirmed to be available locally in this process
+_verified_models = set()
+
+class NDJSONDecoder:
+    """Incrementally decode a newline-delimited JSON stream."""
+
+    def __init__(self):
+        self._buffer = b""
+
+    def feed(self, data):
+        """Feed raw bytes and return every complete JSON object found so far."""
+        self._buffer += data
+        *lines, self._buffer = self._buffer.split(b"\n")
+        return [json.loads(line) for line in lines if line.strip()]
+
+    def flush(self):
+        """Return the last object if the stream did not end with a newline."""
+        remaining, self._buffer = self._buffer.strip(), b""
+        return [json.loads(remaining)] if remaining else []
+
+def _build_payload(model, keep_alive, **fields):
+    """Build a request body, dropping fields that were not provided"""
+    payload = {"model": model, "keep_alive": keep_alive}
+    payload.update({key: value for key, value in fields.items() if value is not None})
+    return payload
+
+class GenerationMetrics:
+    """Timing information collected for a single generation."""
+
+    def __init__(self, start_time):
+        self.start_time = start_time
+        self.time_to_first_token = None
+        self.total_time = None
+        self.eval_count = 0
+        self.eval_duration = 0
+        self.prompt_eval_count = 0
+        self.load_duration = 0
+
+    def record_chunk(self, chunk):
+        """Update the metrics from a streamed chunk"""
+        now = time.perf_counter()
+        if self.time_to_first_token is None and chunk.get("response", chunk.get("message", {}).get("content")):
+            self.time_to_first_token = now - self.start_time
+        if chunk.get("done"):
+            self.total_time = now - self.start_time
+            #Ollama reports durations in nanoseconds
+            self.eval_count = chunk.get("eval_count", 0)
+            self.eval_duration = chunk.get("eval_duration", 0)
+            self.prompt_eval_count = chunk.get("prompt_eval_count", 0)
+            self.load_duration = chunk.get("load_duration", 0)
+
+    @property
+    def tokens_per_second(self):
+        if not self.eval_duration:
+            return 0.0
+        return self.eval_count / (self.eval_duration / 1e9)
+
+    def as_dict(self):
+        return {
+            "time_to_first_token": self.time_to_first_token,
+            "total_time": self.total_time,
+            "eval_count": self.eval_count,
+            "tokens_per_second": self.tokens_per_second,
+            "prompt_eval_count": self.prompt_eval_count,
+            "load_duration": self.load_duration / 1e9,
+        }
+
+class OllamaClient:
+    """Streaming client for the Ollama REST API that reuses keep-alive connections."""
+
+    def __init__(self, base_url=OLLAMA_URL, keep_alive=DEFAULT_KEEP_ALIVE, pool_size=10, timeout=120):
+        self.base_url = base_url.rstrip("/")
+        self.keep_alive = keep_alive
+        self.timeout = timeout
+        self.last_metrics = None
+
+        #One pooled session for every request made by this client
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def _stream(self, endpoint, payload):
+        """Post a streaming request and yield each decoded chunk"""
+        metrics = GenerationMetrics(time.perf_counter())
+        self.last_metrics = metrics
+        decoder = NDJSONDecoder()
+        with self.session.post(f"{self.base_url}{endpoint}", json=payload, stream=True, timeout=self.timeout) as response:
+            response.raise_for_status()
+            for data in response.iter_content(chunk_size=None):
+                for chunk in decoder.feed(data):
+                    metrics.record_chunk(chunk)
+                    yield chunk
+            for chunk in decoder.flush():
+                metrics.record_chunk(chunk)
+                yield chunk
+
+    def generate(self, prompt, model=DEFAULT_MODEL, options=None):
+        """Stream the text generated for a prompt"""
+        payload = _build_payload(model, self.keep_alive, prompt=prompt, options=options, stream=True)
+        for chunk in self._stream("/api/generate", payload):
+            if chunk.get("error"):
+                raise RuntimeError(chunk["error"])
+            yield chunk.get("response", "")
+
+    def chat(self, messages, model=DEFAULT_MODEL, options=None):
+        """Stream the assistant reply for a list of chat messages"""
+        payload = _build_payload(model, self.keep_alive, messages=messages, options=options, stream=True)
+        for chunk in self._stream("/api/chat", payload):
+            if chunk.get("error"):
+                raise RuntimeError(chunk["error"])
+            yield chunk.get("message", {}).get("content", "")
+
+    def list_local_models(self):
+        """Return the names of the models that are already downloaded"""
+        response = self.session.get(f"{self.base_url}/api/tags", timeout=self.timeout)
+        response.raise_for_status()
+        return {model["name"] for model in response.json().get("models", [])}
+
+    def ensure_model(self, model):
+        """Pull a model only if it is not available locally"""
+        if model in _verified_models:
+            return
+        #Untagged names are stored by Ollama under the "latest" tag
+        name = model if ":" in model else f"{model}:latest"
+        if name not in self.list_local_models():
+            response = self.session.post(
+                f"{self.base_url}/api/pull", json={"model": model, "stream": False}, timeout=None
+            )
+            response.raise_for_status()
+        _verified_models.add(model)
+
+    def preload(self, model, embedding=False):
+        """Load a model into memory with a tiny request and pin it with keep_alive"""
+        if embedding:
+            payload = _build_payload(model, self.keep_alive, input="warm up")
+            endpoint = "/api/embed"
+        else:
+            #An empty prompt only loads the model without generating anything
+            payload = _build_payload(model, self.keep_alive, stream=False)
+            endpoint = "/api/generate"
+        response = self.session.post(f"{self.base_url}{endpoint}", json=payload, timeout=self.timeout)
+        response.raise_for_status()
+
+    def close(self):
+        self.session.close()
+
+def ensure_model(model):
+    """Module-level shortcut that only opens a connection the first time a model is checked"""
+    if model in _verified_models:
+        return
+    client = OllamaClient()
+    try:
+        client.ensure_model(model)
+    finally:
+        client.close()
+
+def warm_up(chat_model=DEFAULT_MODEL, embedding_model=None, keep_alive=DEFAULT_KEEP_ALIVE):
+    """Make sure the models exist locally and load them before the first real request"""
+    client = OllamaClient(keep_alive=keep_alive)
+    try:
+        models = [(chat_model, False)]
+        if embedding_model:
+            models.append((embedding_model, True))
+        for model, embedding in models:
+            start = time.perf_counter()
+            client.ensure_model(model)
+            client.preload(model, embedding=embedding)
+            logging.info(f"Model '{model}' loaded in {time.perf_counter() - start:.2f}s.")
+    finally:
+        client.close()
+
+class AsyncOllamaClient:
+    """Async variant of OllamaClient built on a pooled httpx client."""
+
+    def __init__(self, base_url=OLLAMA_URL, keep_alive=DEFAULT_KEEP_ALIVE, pool_size=10, timeout=120):
+        self.base_url = base_url.rstrip("/")
+        self.keep_alive = keep_alive
+        self.last_metrics = None
+        self.client = httpx.AsyncClient(
+            timeout=timeout,
+            limits=httpx.Limits(max_connections=pool_size, max_keepalive_connections=pool_size),
+        )
+
+    async def _stream(self, endpoint, payload):
+        metrics = GenerationMetrics(time.perf_counter())
+        self.last_metrics = metrics
+        decoder = NDJSONDecoder()
+        async with self.client.stream("POST", f"{self.base_url}{endpoint}", json=payload) as response:
+            response.raise_for_status()
+            async for data in response.aiter_bytes():
+                for chunk in decoder.feed(data):
+                    metrics.record_chunk(chunk)
+                    yield chunk
+            for chunk in decoder.flush():
+                metrics.record_chunk(chunk)
+                yield chunk
+
+    async def generate(self, prompt, model=DEFAULT_MODEL, options=None):
+        """Stream the text generated for a prompt"""
+        payload = _build_payload(model, self.keep_alive, prompt=prompt, options=options, stream=True)
+        async for chunk in self._stream("/api/generate", payload):
+            if chunk.get("error"):
+                raise RuntimeError(chunk["error"])
+            yield chunk.get("response", "")
+
+    async def chat(self, messages, model=DEFAULT_MODEL, options=None):
+        """Stream the assistant reply for a list of chat messages"""
+        payload = _build_payload(model, self.keep_alive, messages=messages, options=options, stream=True)
+        async for chunk in self._stream("/api/chat", payload):
+            if chunk.get("error"):
+                raise RuntimeError(chunk["error"])
+            yield chunk.get("message", {}).get("content", "")
+
+    async def aclose(self):
+        await self.client.aclose()
+
+if __name__ == "__main__":
+    client = OllamaClient()
+    for text in client.generate("tell me a funny joke"):
+        print(text, end="", flush=True)
+    print("\n", client.last_metrics.as_dict())
+
+    async def demo():
+        async_client = AsyncOllamaClient()
+        async for text in async_client.generate("tell me another joke"):
+            print(text, end="", flush=True)
+        print("\n", async_client.last_metrics.as_dict())
+        await async_client.aclose()
+
+    asyncio.run(demo())
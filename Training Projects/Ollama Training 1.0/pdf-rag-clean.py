@@ -9,7 +9,7 @@ from langchain_core.runnables import RunnablePassthrough
 from langchain.retrievers.multi_query import MultiQueryRetriever
 import logging
 import os
-import ollama
+from ollama_client import ensure_model, warm_up
 import sys
 
 logging.basicConfig(
@@ -25,6 +25,8 @@ DOC_PATH = "./data/Hardening Windows 11.pdf"
 MODEL_NAME = "llama3.2"
 EMBEDDING_MODEL = "nomic-embed-text"
 VECTOR_STORE_NAME = "simple-rag"
+#Seconds to keep models loaded; an integer because OllamaEmbeddings only accepts one
+KEEP_ALIVE = 30 * 60
 
 def ingest_pdf(doc_path):
     """Load PDF documents."""
@@ -46,12 +48,12 @@ def split_documents(documents):
 
 def create_vector_db(chunks):
     """Create a vector database from document chunks."""
-    #Pull the embedding model if not already available
-    ollama.pull(EMBEDDING_MODEL)
+    #Pull the embedding model only if it is not available locally
+    ensure_model(EMBEDDING_MODEL)
 
     vector_db = Chroma.from_documents(
         documents=chunks,
-        embedding=OllamaEmbeddings(model=EMBEDDING_MODEL),
+        embedding=OllamaEmbeddings(model=EMBEDDING_MODEL, keep_alive=KEEP_ALIVE),
         collection_name=VECTOR_STORE_NAME
     )
     logging.info("Vector database created.")
@@ -93,6 +95,9 @@ def create_chain(retriever, llm):
     return chain
 
 def main():
+    #Load the chat and embedding models once so the first question is not slowed down
+    warm_up(MODEL_NAME, EMBEDDING_MODEL, keep_alive=KEEP_ALIVE)
+
     # Load and process the pdf document
     data = ingest_pdf(DOC_PATH)
     if data is None:
@@ -105,7 +110,7 @@ def main():
     vector_db = create_vector_db(chunks)
 
     #Initialize the language model
-    llm = ChatOllama(model=MODEL_NAME)
+    llm = ChatOllama(model=MODEL_NAME, keep_alive=KEEP_ALIVE)
 
     #Create the retriever
     retriever = create_retriever(vector_db,llm)
@@ -10,7 +10,7 @@ from langchain.retrievers.multi_query import MultiQueryRetriever
 import streamlit as st
 import logging
 import os
-import ollama
+from ollama_client import ensure_model, warm_up
 import sys
 
 logging.basicConfig(
@@ -26,6 +26,8 @@ DOC_PATH = "./data/Hardening Windows 11.pdf"
 MODEL_NAME = "llama3.2"
 EMBEDDING_MODEL = "nomic-embed-text"
 VECTOR_STORE_NAME = "simple-rag"
+#Seconds to keep models loaded; an integer because OllamaEmbeddings only accepts one
+KEEP_ALIVE = 30 * 60
 PERSIST_DIRECTORY = "./chroma_db"
 
 def ingest_pdf(doc_path):
@@ -46,13 +48,18 @@ def split_documents(documents):
     logging.info("Documents split into chunks.")
     return chunks
 
+@st.cache_resource
+def warm_up_models():
+    """Preload the chat and embedding models once per server process"""
+    warm_up(MODEL_NAME, EMBEDDING_MODEL, keep_alive=KEEP_ALIVE)
+
 @st.cache_resource
 def load_vector_db():
     """Load or create the vector database"""
-    #Pull the embedding model if not already available
-    ollama.pull(EMBEDDING_MODEL)
+    #Pull the embedding model only if it is not available locally
+    ensure_model(EMBEDDING_MODEL)
 
-    embedding = OllamaEmbeddings(model = EMBEDDING_MODEL)
+    embedding = OllamaEmbeddings(model = EMBEDDING_MODEL, keep_alive=KEEP_ALIVE)
 
     if os.path.exists(PERSIST_DIRECTORY):
         vector_db = Chroma(
@@ -82,12 +89,12 @@ def load_vector_db():
 
 def create_vector_db(chunks):
     """Create a vector database from document chunks."""
-    #Pull the embedding model if not already available
-    ollama.pull(EMBEDDING_MODEL)
+    #Pull the embedding model only if it is not available locally
+    ensure_model(EMBEDDING_MODEL)
 
     vector_db = Chroma.from_documents(
         documents=chunks,
-        embedding=OllamaEmbeddings(model=EMBEDDING_MODEL),
+        embedding=OllamaEmbeddings(model=EMBEDDING_MODEL, keep_alive=KEEP_ALIVE),
         collection_name=VECTOR_STORE_NAME
     )
     logging.info("Vector database created.")
@@ -131,6 +138,12 @@ def create_chain(retriever, llm):
 def main():
     st.title("Document Assistant")
 
+    #Load the models at startup instead of on the first question
+    try:
+        warm_up_models()
+    except Exception as e:
+        logging.warning(f"Model warm-up failed: {str(e)}")
+
     #User input
     user_input = st.text_input("Enter your question:")
 
@@ -138,13 +151,13 @@ def main():
         with st.spinner("Generating response...."):
             try:
                 #Init LLM
-                llm = ChatOllama(model=MODEL_NAME)
+                llm = ChatOllama(model=MODEL_NAME, keep_alive=KEEP_ALIVE)
 
                 #Create the vector database
                 vector_db = load_vector_db()
 
                 #Initialize the language model
-                llm = ChatOllama(model=MODEL_NAME)
+                llm = ChatOllama(model=MODEL_NAME, keep_alive=KEEP_ALIVE)
 
                 #Create the retriever
                 retriever = create_retriever(vector_db,llm)
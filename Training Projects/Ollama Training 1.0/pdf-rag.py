@@ -33,12 +33,13 @@ print("Done splitting PDF into chunks...")
 
 ## Step: Add Vector Database for Storing Embeddings
 
-import ollama
-ollama.pull("nomic-embed-text")  # Ensure the embedding model is available.
+from ollama_client import warm_up
+KEEP_ALIVE = 30 * 60  # Seconds to keep the models loaded after each request.
+warm_up("llama3.2", "nomic-embed-text", keep_alive=KEEP_ALIVE)  # Pull only missing models and load them into memory.
 
 vector_db = Chroma.from_documents(
     documents=chunks,
-    embedding=OllamaEmbeddings(model="nomic-embed-text"),
+    embedding=OllamaEmbeddings(model="nomic-embed-text", keep_alive=KEEP_ALIVE),
     collection_name="simple-rag",
 )
 
@@ -54,7 +55,7 @@ from langchain.retrievers.multi_query import MultiQueryRetriever
 
 # Set up the language model for generating embeddings.
 model = 'llama3.2'
-llm = ChatOllama(model=model)
+llm = ChatOllama(model=model, keep_alive=KEEP_ALIVE)
 
 ## Define a prompt template to generate multiple versions of a user's question.
 
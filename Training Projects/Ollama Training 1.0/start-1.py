@@ -1,26 +1,19 @@
 import requests
-import json
+from ollama_client import OllamaClient
 
-url = "http://localhost:11434/api/generate"
+client = OllamaClient()
 
-data = {
-    "model" : "deepseek-r1",
-    "prompt" : "tell me a funny joke"
-}
-
-response = requests.post(url,json=data, stream = True)
-
-#Check the response status
-if response.status_code == 200:
+#Stream the response over the client's pooled keep-alive session
+try:
     print("Generate Text:", end=" ", flush = True)
-    #Iterate over the streaming response
-    for line in response.iter_lines():
-        if line:
-            #Decode the line and parse the JSON
-            decoded_line = line.decode("utf-8")
-            result = json.loads(decoded_line)
-            #Get the text from the response
-            generated_text = result.get("response","")
-            print(generated_text,end="", flush=True)
-else:
-    print("Error:", response.status_code, response.text)
\ No newline at end of file
+    for generated_text in client.generate("tell me a funny joke", model="deepseek-r1"):
+        print(generated_text,end="", flush=True)
+
+    metrics = client.last_metrics
+    #No first token is recorded when the stream produced no text
+    if metrics.time_to_first_token is None:
+        print(f"\n\nNo text generated, {metrics.tokens_per_second:.1f} tokens/sec")
+    else:
+        print(f"\n\nTime to first token: {metrics.time_to_first_token:.2f}s, {metrics.tokens_per_second:.1f} tokens/sec")
+except requests.HTTPError as e:
+    print("Error:", e.response.status_code, e.response.text)